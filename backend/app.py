@@ -2,19 +2,29 @@ import logging
 import time
 
 import requests
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory
 from flask_cors import CORS
 
 from config import (
     BASE_DIR,
-    FRONTEND_DIR,
     FRONTEND_ASSETS_DIR,
     EXPORTS_DIR,
     WALLETS_DIR,
     CORS_ORIGINS,
     ensure_directories,
 )
+from compression import init_compression
 from jobs import JOBS, create_job
+from static_assets import send_asset, send_index
+from tx_export import iter_csv, iter_jsonl
+from tx_parser import filter_txs_by_birthday, iter_filtered_txs, sort_txs
+from wallet_store import (
+    export_path_for_slug,
+    is_valid_slug,
+    latest_height,
+    load_wallet_transactions,
+    transactions_since,
+)
 
 # --------------------------------------------------------------------------
 # Logging
@@ -26,6 +36,23 @@ logging.basicConfig(
 log = logging.getLogger(__name__)
 
 
+def int_args(*names):
+    """
+    Optional integer query parameters, as a dict (None when absent).
+
+    Raises ValueError("Invalid <name>") for a value that is not an integer;
+    request.args.get(name, type=int) would silently drop it instead.
+    """
+    values = {}
+    for name in names:
+        raw = request.args.get(name)
+        try:
+            values[name] = int(raw) if raw not in (None, "") else None
+        except ValueError:
+            raise ValueError(f"Invalid {name}") from None
+    return values
+
+
 def create_app() -> Flask:
     app = Flask(__name__, static_folder=None)  # we'll serve assets ourselves
 
@@ -35,20 +62,24 @@ def create_app() -> Flask:
     # CORS for /api/*
     CORS(app, resources={r"/api/*": {"origins": CORS_ORIGINS}})
 
+    # gzip/brotli for JSON + text responses above COMPRESS_MIN_SIZE
+    init_compression(app)
+
     # ----------------------------------------------------------------------
     # Frontend routes
     # ----------------------------------------------------------------------
     @app.route("/")
     def index():
         log.info("GET / from %s", request.remote_addr)
-        return send_from_directory(FRONTEND_DIR, "index.html")
+        return send_index()
 
     @app.route("/assets/<path:filename>")
     def frontend_assets(filename):
         """
         Serve frontend assets (CSS, JS, favicon, etc).
+        Fingerprinted URLs (?v=<hash>) are cached as immutable.
         """
-        return send_from_directory(FRONTEND_ASSETS_DIR, filename)
+        return send_asset(filename)
 
     @app.route("/favicon.ico")
     def favicon_ico():
@@ -73,11 +104,23 @@ def create_app() -> Flask:
             view_key = (data.get("view_key") or "").strip()
             birthday = data.get("birthday")
             wallet_name = (data.get("wallet_name") or "webwallet").strip()
+            since_height = data.get("since_height")
 
             if not view_key or not birthday:
                 return jsonify({"status": "error", "error": "Missing key or birthday"}), 400
 
-            job_id = create_job(view_key, int(birthday), wallet_name)
+            if since_height is not None:
+                try:
+                    since_height = int(since_height)
+                except (TypeError, ValueError):
+                    return jsonify({"status": "error", "error": "Invalid since_height"}), 400
+
+            job_id = create_job(
+                view_key,
+                int(birthday),
+                wallet_name,
+                since_height=since_height,
+            )
             return jsonify({"status": "ok", "job_id": job_id})
 
         except Exception as e:
@@ -122,6 +165,132 @@ def create_app() -> Flask:
                 }
             )
 
+    @app.route("/api/wallet/<slug>/transactions", methods=["GET"])
+    def api_wallet_transactions(slug):
+        """
+        Transactions from the last sync of this wallet.
+
+        With ?since_height=N only transactions mined above N (or not yet
+        mined) are returned, so a client with a cached result can catch up
+        cheaply. ?birthday=H drops transactions mined below H, as the import
+        job result does. Responses carry an ETag; If-None-Match gives a 304.
+        """
+        if not is_valid_slug(slug):
+            return jsonify({"status": "error", "error": "Invalid wallet id"}), 400
+
+        try:
+            args = int_args("since_height", "birthday")
+        except ValueError as e:
+            return jsonify({"status": "error", "error": str(e)}), 400
+        since_height, birthday = args["since_height"], args["birthday"]
+
+        txs, version = load_wallet_transactions(slug)
+        if txs is None:
+            return jsonify({"status": "error", "error": "Wallet not found"}), 404
+
+        etag = "-".join(
+            [
+                version,
+                str(birthday) if birthday is not None else "any",
+                str(since_height) if since_height is not None else "all",
+            ]
+        )
+        # Weak comparison: compression hands clients a weak W/"..." ETag
+        if request.if_none_match.contains_weak(etag):
+            resp = app.response_class(status=304)
+            resp.set_etag(etag)
+            return resp
+
+        txs = filter_txs_by_birthday(txs, birthday)
+        delta = transactions_since(txs, since_height)
+        resp = jsonify(
+            {
+                "status": "ok",
+                "slug": slug,
+                "since_height": since_height,
+                "latest_height": latest_height(txs),
+                "delta": since_height is not None,
+                "transactions": delta,
+            }
+        )
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
+
+    @app.route("/api/wallet/<slug>/raw", methods=["GET"])
+    def api_wallet_raw(slug):
+        """
+        Raw list-tx export for this wallet, loaded on demand by the UI.
+
+        send_file handles Range (206 partial pages), ETag/If-None-Match and
+        hands the open file to the WSGI server's file_wrapper, which uses
+        sendfile() where the server supports it.
+        """
+        if not is_valid_slug(slug):
+            return jsonify({"status": "error", "error": "Invalid wallet id"}), 400
+
+        try:
+            resp = send_file(
+                export_path_for_slug(slug),
+                mimetype="text/plain",
+                conditional=True,
+                etag=True,
+                max_age=0,
+            )
+        except FileNotFoundError:
+            return jsonify({"status": "error", "error": "Wallet not found"}), 404
+
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
+
+    @app.route("/api/wallet/<slug>/export.<fmt>", methods=["GET"])
+    def api_wallet_export(slug, fmt):
+        """
+        Stream the wallet's transactions as CSV or JSON Lines.
+
+        Accepts the UI's filters: q, height_from, height_to, sort and
+        birthday (non-integer heights are rejected with 400). Rows are
+        generated while the response is written; without ?sort they stay in
+        stored order and nothing is copied per request. Wallets larger than
+        WALLET_CACHE_MAX_TXS are not kept in memory and get parsed on every
+        request.
+        """
+        exporters = {
+            "csv": (iter_csv, "text/csv; charset=utf-8"),
+            "jsonl": (iter_jsonl, "application/x-ndjson; charset=utf-8"),
+        }
+        if fmt not in exporters:
+            return jsonify({"status": "error", "error": "Unsupported export format"}), 404
+        if not is_valid_slug(slug):
+            return jsonify({"status": "error", "error": "Invalid wallet id"}), 400
+
+        try:
+            args = int_args("height_from", "height_to", "birthday")
+        except ValueError as e:
+            return jsonify({"status": "error", "error": str(e)}), 400
+
+        txs, _ = load_wallet_transactions(slug)
+        if txs is None:
+            return jsonify({"status": "error", "error": "Wallet not found"}), 404
+
+        rows = iter_filtered_txs(
+            txs,
+            query=request.args.get("q"),
+            height_from=args["height_from"],
+            height_to=args["height_to"],
+            min_height=args["birthday"],
+        )
+        sort_mode = request.args.get("sort")
+        if sort_mode:
+            rows = sort_txs(rows, sort_mode)
+
+        log.info("Streaming %s export for %s", fmt, slug)
+        iter_rows, content_type = exporters[fmt]
+        resp = Response(iter_rows(rows), content_type=content_type)
+        resp.headers["Content-Disposition"] = f'attachment; filename="{slug}.{fmt}"'
+        resp.headers["Cache-Control"] = "no-store"
+        return resp
+
     @app.route("/api/height", methods=["GET"])
     def api_height():
         """
@@ -0,0 +1,131 @@
+import gzip
+import logging
+import zlib
+
+from flask import request
+
+from config import COMPRESS_MIN_SIZE, COMPRESSIBLE_MIMETYPES
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+log = logging.getLogger(__name__)
+
+
+def supported_encodings():
+    """
+    Content-Encodings this server can produce, most preferred first.
+    """
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: str, supported=None):
+    """
+    Pick the best of supported (default: supported_encodings()) that the
+    client accepts, or None for identity. "*" covers any encoding not
+    explicitly refused with q=0.
+    """
+    accepted = set()
+    refused = set()
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        (accepted if q > 0 else refused).add(name.strip())
+
+    for encoding in supported if supported is not None else supported_encodings():
+        if encoding in refused:
+            continue
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def is_compressible(mimetype: str) -> bool:
+    return (mimetype or "").split(";")[0].strip() in COMPRESSIBLE_MIMETYPES
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    Compress a whole body. best=True is for static assets compressed once.
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9 if best else 6)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def _gzip_stream(chunks):
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip framing
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = comp.compress(chunk)
+        if data:
+            yield data
+    yield comp.flush()
+
+
+def _weaken_etag(response):
+    # A compressed body is a different byte sequence: strong ETags no longer hold.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_response(response):
+    """
+    after_request hook: gzip/brotli compressible responses when the client
+    accepts it. File responses (send_file, Range, sendfile) are left alone;
+    static assets are compressed once in static_assets.py instead.
+    """
+    if not is_compressible(response.mimetype):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or "Content-Range" in response.headers
+    ):
+        return response
+
+    accept_encoding = request.headers.get("Accept-Encoding", "")
+
+    if response.is_streamed:
+        # Streamed exports: gzip chunk by chunk, memory stays flat.
+        if choose_encoding(accept_encoding, ["gzip"]) is None:
+            return response
+        response.response = _gzip_stream(response.response)
+        response.headers.pop("Content-Length", None)
+        response.headers["Content-Encoding"] = "gzip"
+        _weaken_etag(response)
+        return response
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    _weaken_etag(response)
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
@@ -6,9 +6,9 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 FRONTEND_DIR = os.path.join(BASE_DIR, "..", "frontend")
 FRONTEND_ASSETS_DIR = os.path.join(FRONTEND_DIR, "assets")
 
-# Data dirs
-EXPORTS_DIR = os.path.join(BASE_DIR, "exports")
-WALLETS_DIR = os.path.join(BASE_DIR, "wallets")
+# Data dirs (overridable so load tests can run against a scratch directory)
+EXPORTS_DIR = os.environ.get("VIEWKEY_EXPORTS_DIR") or os.path.join(BASE_DIR, "exports")
+WALLETS_DIR = os.environ.get("VIEWKEY_WALLETS_DIR") or os.path.join(BASE_DIR, "wallets")
 
 # CORS allowed origins
 CORS_ORIGINS = [
@@ -20,6 +20,32 @@ CORS_ORIGINS = [
     "http://127.0.0.1:5000",
 ]
 
+# Parsed wallet exports kept in memory by wallet_store, bounded by the total
+# number of transactions across wallets (a bigger single wallet is not cached)
+WALLET_CACHE_MAX_TXS = int(os.environ.get("VIEWKEY_WALLET_CACHE_MAX_TXS", "200000"))
+
+# Optionally give up on an import job (and kill its read_view_key.py /
+# zcash-devtool processes) after this many seconds. Unset or 0 = no limit:
+# a first sync from an old birthday can legitimately take very long.
+JOB_TIMEOUT_SECONDS = int(os.environ.get("VIEWKEY_JOB_TIMEOUT") or 0) or None
+
+# Response compression (gzip always, brotli if the "brotli" package is installed)
+COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies are sent as-is
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/javascript",
+    "text/css",
+    "text/html",
+    "text/plain",
+    "text/csv",
+    "image/svg+xml",
+}
+# Serve foo.js.br / foo.js.gz next to an asset when present
+# (generate them with: python static_assets.py)
+USE_PRECOMPRESSED_ASSETS = os.environ.get("VIEWKEY_PRECOMPRESSED_ASSETS", "1") == "1"
+
 # Hex characters for txid detection
 HEX_CHARS = set(string.hexdigits)
 
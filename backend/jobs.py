@@ -1,14 +1,16 @@
 import hashlib
 import logging
 import os
+import signal
 import subprocess
 import sys
 import threading
 import time
 
-from config import BASE_DIR, EXPORTS_DIR, WALLETS_DIR
-from tx_parser import parse_list_tx_text, filter_txs_by_birthday
+from config import BASE_DIR, EXPORTS_DIR, JOB_TIMEOUT_SECONDS, WALLETS_DIR
+from tx_parser import parse_list_tx_lines, filter_txs_by_birthday
 from wallet_utils import wallet_slug_from_key
+from wallet_store import latest_height, transactions_since
 
 log = logging.getLogger(__name__)
 
@@ -35,7 +37,33 @@ def simulate_progress(job_id, stop_event, max_progress=80):
         log.exception("simulate_progress crashed for job %s", job_id)
 
 
-def background_sync_task(job_id, view_key, birthday, wallet_name):
+def run_tool(cmd, timeout):
+    """
+    subprocess.run() for read_view_key.py, except that on timeout (None =
+    no limit) the whole process group is killed: zcash-devtool runs as a
+    grandchild and would otherwise keep running (and keep the output pipes
+    open).
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+        proc.communicate()
+        raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def background_sync_task(job_id, view_key, birthday, wallet_name, since_height=None):
     slug = wallet_slug_from_key(view_key)
     wallet_dir = os.path.join(WALLETS_DIR, slug)
     output_prefix = os.path.join(EXPORTS_DIR, f"{slug}_txs")
@@ -71,7 +99,16 @@ def background_sync_task(job_id, view_key, birthday, wallet_name):
     try:
         job["message"] = "Syncing wallet…"
         job["progress"] = max(job.get("progress", 5), 20)
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        try:
+            result = run_tool(cmd, JOB_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            stop_event.set()
+            prog_thread.join(timeout=1)
+            log.error("Job %s timed out after %ss", job_id, JOB_TIMEOUT_SECONDS)
+            job["status"] = "failed"
+            job["error"] = "Backend tool timed out."
+            job["message"] = "Sync timed out."
+            return
 
         # stop the simulated progress
         stop_event.set()
@@ -96,9 +133,7 @@ def background_sync_task(job_id, view_key, birthday, wallet_name):
         job["message"] = "Parsing results…"
 
         with open(txt_path, "r", encoding="utf-8") as f:
-            text = f.read()
-
-        parsed = parse_list_tx_text(text)
+            parsed = parse_list_tx_lines([line.rstrip("\r\n") for line in f])
         parsed = filter_txs_by_birthday(parsed, birthday)
 
         job["result"] = {
@@ -107,8 +142,16 @@ def background_sync_task(job_id, view_key, birthday, wallet_name):
             "birthday": birthday,
             "slug": slug,
             "file": os.path.basename(txt_path),
-            "raw_text": text,
-            "transactions": parsed,
+            # Raw list-tx text is served on demand by /api/wallet/<slug>/raw
+            "raw": {
+                "url": f"/api/wallet/{slug}/raw",
+                "size": os.path.getsize(txt_path),
+            },
+            "latest_height": latest_height(parsed),
+            # Client already has everything up to since_height: send the delta only
+            "delta": since_height is not None,
+            "since_height": since_height,
+            "transactions": transactions_since(parsed, since_height),
         }
         job["status"] = "done"
         job["progress"] = 100
@@ -124,9 +167,11 @@ def background_sync_task(job_id, view_key, birthday, wallet_name):
         job["message"] = "Sync crashed."
 
 
-def create_job(view_key: str, birthday: int, wallet_name: str) -> str:
+def create_job(view_key: str, birthday: int, wallet_name: str, since_height=None) -> str:
     """
     Create a new job entry and start the background thread.
+    If since_height is given, the result only carries transactions newer
+    than that height (see wallet_store.transactions_since).
     Returns the new job_id.
     """
     job_id = hashlib.sha256(f"{view_key}{time.time()}".encode()).hexdigest()[:12]
@@ -139,7 +184,7 @@ def create_job(view_key: str, birthday: int, wallet_name: str) -> str:
 
     thread = threading.Thread(
         target=background_sync_task,
-        args=(job_id, view_key, int(birthday), wallet_name),
+        args=(job_id, view_key, int(birthday), wallet_name, since_height),
     )
     thread.start()
 
@@ -0,0 +1,200 @@
+"""
+Stand-in for zcash-devtool, used to load-test the service without talking
+to a real lightwalletd server.
+
+It understands the subset of the CLI that read_view_key.py drives:
+
+    fake_devtool.py wallet -w <dir> init-fvk --name N --fvk K --birthday H -s S --disable-tor
+    fake_devtool.py wallet -w <dir> sync -s S
+    fake_devtool.py wallet -w <dir> enhance -s S --disable-tor
+    fake_devtool.py wallet -w <dir> list-tx
+
+Select it with:
+
+    ZCASH_DEVTOOL_CMD="python /path/to/backend/loadtest/fake_devtool.py"
+
+Behaviour is configured through environment variables (inherited from the
+Flask process, so run_load.py can set them once for every job):
+
+    FAKE_DEVTOOL_LATENCY     seconds per command, either one number for every
+                             command or "sync=3,enhance=1,list-tx=0.2"
+    FAKE_DEVTOOL_JITTER      +/- fraction applied to the latency (default 0.2)
+    FAKE_DEVTOOL_FAIL_RATE   probability (0..1) that a run fails (default 0)
+    FAKE_DEVTOOL_FAIL_MODE   exit | treestate | locked | missing | hang
+    FAKE_DEVTOOL_FAIL_STEP   command that fails (default: sync)
+    FAKE_DEVTOOL_TXS         number of transactions list-tx prints (default 50)
+    FAKE_DEVTOOL_MEMO_BYTES  memo length per output (default 64)
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+DEFAULT_LATENCY = {
+    "init-fvk": 0.2,
+    "sync": 2.0,
+    "enhance": 0.5,
+    "list-tx": 0.1,
+}
+
+# Stderr that mimics real zcash-devtool failures (the cases
+# wallet_utils.run_read_view_key() tells apart). The HTTP job path does not
+# classify them: every mode shows up as "Backend tool failed" in run_load.py;
+# the modes differ in the server log only.
+FAIL_MESSAGES = {
+    "exit": "Error: simulated zcash-devtool failure",
+    "treestate": "Error: GetTreeState failed: status: InvalidArgument",
+    "locked": "Error: SqliteClientError(database is locked)",
+    "missing": "Error: No such file or directory (os error 2)",
+}
+
+STATE_FILE = "fake_wallet.json"
+
+
+def env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def latency_for(command):
+    """
+    Resolve FAKE_DEVTOOL_LATENCY for one command.
+    """
+    raw = os.environ.get("FAKE_DEVTOOL_LATENCY", "").strip()
+    latency = DEFAULT_LATENCY.get(command, 0.0)
+
+    if raw:
+        if "=" not in raw:
+            latency = float(raw)
+        else:
+            for part in raw.split(","):
+                name, _, value = part.partition("=")
+                if name.strip() == command:
+                    latency = float(value)
+
+    jitter = env_float("FAKE_DEVTOOL_JITTER", 0.2)
+    return max(0.0, latency * random.uniform(1 - jitter, 1 + jitter))
+
+
+def maybe_fail(command):
+    """
+    Fail this command according to FAKE_DEVTOOL_FAIL_* settings.
+    """
+    if os.environ.get("FAKE_DEVTOOL_FAIL_STEP", "sync") != command:
+        return
+    if random.random() >= env_float("FAKE_DEVTOOL_FAIL_RATE", 0.0):
+        return
+
+    mode = os.environ.get("FAKE_DEVTOOL_FAIL_MODE", "exit")
+    if mode == "hang":
+        # Never finishes; exercises how the job system copes with stuck syncs.
+        while True:
+            time.sleep(60)
+
+    print(FAIL_MESSAGES.get(mode, FAIL_MESSAGES["exit"]), file=sys.stderr)
+    sys.exit(1)
+
+
+def load_state(wallet_dir):
+    path = os.path.join(wallet_dir, STATE_FILE)
+    if not os.path.exists(path):
+        print(f"Error: No such file or directory (os error 2): {path}", file=sys.stderr)
+        sys.exit(1)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_list_tx(state):
+    """
+    Produce list-tx text in the layout tx_parser.parse_list_tx_text() expects.
+    Output is deterministic per wallet so repeated syncs return the same txs.
+    """
+    rng = random.Random(state["fvk"])
+    tx_count = env_int("FAKE_DEVTOOL_TXS", 50)
+    memo_bytes = env_int("FAKE_DEVTOOL_MEMO_BYTES", 64)
+    birthday = int(state["birthday"])
+
+    lines = ["Transactions:"]
+    height = birthday
+    for i in range(tx_count):
+        height += rng.randint(1, 500)
+        txid = hashlib.sha256(f"{state['fvk']}:{i}".encode("utf-8")).hexdigest()
+        mined = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(1477641360 + height * 75))
+        zats = rng.randint(1, 10_000_000_000)
+        memo = (f"memo {i} " * (memo_bytes // 7 + 1))[:memo_bytes]
+
+        lines.append(txid)
+        lines.append(f"     Mined: {height} ({mined})")
+        lines.append(f"    Amount: {zats / 1e8:.8f} ZEC")
+        lines.append("  Fee paid: 0.00010000 ZEC")
+        lines.append("  Sent 0 notes, 1 memos")
+        lines.append("  Output 0 (Orchard)")
+        lines.append(f"    Value: {zats / 1e8:.8f} ZEC")
+        lines.append(f"    Received by account: {state['name']}")
+        lines.append(f"    To: u1fake{txid[:40]}")
+        lines.append(f'    Memo: Memo::Text("{memo}")')
+        lines.append("")
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake zcash-devtool for load testing.")
+    sub = parser.add_subparsers(dest="group", required=True)
+
+    wallet = sub.add_parser("wallet")
+    wallet.add_argument("-w", "--wallet-dir", required=True)
+    cmds = wallet.add_subparsers(dest="command", required=True)
+
+    init = cmds.add_parser("init-fvk")
+    init.add_argument("--name", required=True)
+    init.add_argument("--fvk", required=True)
+    init.add_argument("--birthday", required=True, type=int)
+    init.add_argument("-s", "--server", default="zecrocks")
+    init.add_argument("--disable-tor", action="store_true")
+
+    sync = cmds.add_parser("sync")
+    sync.add_argument("-s", "--server", default="zecrocks")
+
+    enhance = cmds.add_parser("enhance")
+    enhance.add_argument("-s", "--server", default="zecrocks")
+    enhance.add_argument("--disable-tor", action="store_true")
+
+    cmds.add_parser("list-tx")
+
+    args = parser.parse_args()
+
+    time.sleep(latency_for(args.command))
+    maybe_fail(args.command)
+
+    if args.command == "init-fvk":
+        os.makedirs(args.wallet_dir, exist_ok=True)
+        with open(os.path.join(args.wallet_dir, STATE_FILE), "w", encoding="utf-8") as f:
+            json.dump({"name": args.name, "fvk": args.fvk, "birthday": args.birthday}, f)
+        print(f"Initialized wallet '{args.name}' at birthday {args.birthday}")
+        return
+
+    state = load_state(args.wallet_dir)
+
+    if args.command == "sync":
+        print(f"Synced wallet '{state['name']}' (fake)")
+    elif args.command == "enhance":
+        print(f"Enhanced transactions for '{state['name']}' (fake)")
+    elif args.command == "list-tx":
+        sys.stdout.write(build_list_tx(state))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+Load-test driver for the viewing-key service.
+
+Simulates N concurrent users doing POST /api/import and then polling
+GET /api/job/<id> until a result arrives, and reports throughput,
+time-to-result percentiles, error rates and the server's memory high-water
+mark.
+
+By default it starts its own Flask server wired to fake_devtool.py with
+scratch exports/ and wallets/ dirs, so it needs no network:
+
+    cd backend
+    python loadtest/run_load.py --users 50 --jobs-per-user 2
+
+Fake devtool behaviour is set with --latency/--fail-rate/... (see
+fake_devtool.py for the matching FAKE_DEVTOOL_* variables). Use --base-url
+to point at an already running server instead; memory is then not measured.
+"""
+import argparse
+import concurrent.futures
+import os
+import secrets
+import shlex
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(LOADTEST_DIR)
+FAKE_DEVTOOL = os.path.join(LOADTEST_DIR, "fake_devtool.py")
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def read_rss_kb(pid: int):
+    """
+    Return (VmRSS, VmHWM) in kB for pid plus its live descendants' VmRSS,
+    or None where /proc is unavailable.
+    """
+    def status(p):
+        fields = {}
+        try:
+            with open(f"/proc/{p}/status", "r", encoding="utf-8") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    fields[key] = value.strip()
+        except OSError:
+            return None
+        return fields
+
+    root = status(pid)
+    if root is None:
+        return None
+
+    def kb(fields, key):
+        return int(fields.get(key, "0 kB").split()[0])
+
+    rss = kb(root, "VmRSS")
+    hwm = kb(root, "VmHWM")
+
+    # Include job subprocesses (read_view_key.py -> fake devtool).
+    for child in descendant_pids(pid):
+        fields = status(child)
+        if fields:
+            rss += kb(fields, "VmRSS")
+
+    return rss, hwm
+
+
+def _descends_from(child: int, ancestor: int) -> bool:
+    p = child
+    for _ in range(8):
+        try:
+            with open(f"/proc/{p}/stat", "r", encoding="utf-8") as f:
+                p = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            return False
+        if p == ancestor:
+            return True
+        if p <= 1:
+            return False
+    return False
+
+
+def descendant_pids(pid: int):
+    """
+    Live descendants of pid (empty where /proc is unavailable).
+    """
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return []
+    return [int(p) for p in entries if p.isdigit() and _descends_from(int(p), pid)]
+
+
+class MemorySampler(threading.Thread):
+    """
+    Periodically samples server RSS so we can report the high-water mark
+    of the server process and of the whole process tree.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.25):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.stop_event = threading.Event()
+        # Stay None when /proc is unavailable (reported as n/a)
+        self.server_hwm_kb = None
+        self.tree_peak_kb = None
+
+    def run(self):
+        while not self.stop_event.is_set():
+            sample = read_rss_kb(self.pid)
+            if sample is None:
+                return
+            tree_rss, hwm = sample
+            self.server_hwm_kb = max(self.server_hwm_kb or 0, hwm)
+            self.tree_peak_kb = max(self.tree_peak_kb or 0, tree_rss)
+            self.stop_event.wait(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+        self.join(timeout=2)
+
+
+def start_server(args, scratch_dir: str):
+    port = free_port()
+    env = dict(os.environ)
+    env.update(
+        {
+            "ZCASH_DEVTOOL_CMD": f"{shlex.quote(sys.executable)} {shlex.quote(FAKE_DEVTOOL)}",
+            "VIEWKEY_EXPORTS_DIR": os.path.join(scratch_dir, "exports"),
+            "VIEWKEY_WALLETS_DIR": os.path.join(scratch_dir, "wallets"),
+            "FAKE_DEVTOOL_LATENCY": args.latency,
+            "FAKE_DEVTOOL_JITTER": str(args.jitter),
+            "FAKE_DEVTOOL_FAIL_RATE": str(args.fail_rate),
+            "FAKE_DEVTOOL_FAIL_MODE": args.fail_mode,
+            "FAKE_DEVTOOL_FAIL_STEP": args.fail_step,
+            "FAKE_DEVTOOL_TXS": str(args.txs),
+            "FAKE_DEVTOOL_MEMO_BYTES": str(args.memo_bytes),
+        }
+    )
+    # Jobs only time out when asked to, like in production
+    env.pop("VIEWKEY_JOB_TIMEOUT", None)
+    if args.tool_timeout:
+        env["VIEWKEY_JOB_TIMEOUT"] = str(args.tool_timeout)
+
+    log_path = os.path.join(scratch_dir, "server.log")
+    log_file = open(log_path, "w", encoding="utf-8")
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "from app import app; "
+            f"app.run(host='127.0.0.1', port={port}, threaded=True, debug=False)",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+        # Own process group, so stop_server() also reaches job subprocesses
+        start_new_session=True,
+    )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited early; see {log_path}")
+        try:
+            requests.get(base_url + "/health", timeout=1)
+            return proc, base_url, log_file, log_path
+        except requests.RequestException:
+            time.sleep(0.2)
+
+    stop_server(proc)
+    raise RuntimeError(f"Server did not come up; see {log_path}")
+
+
+def stop_server(proc):
+    """
+    Terminate the server and everything it spawned (read_view_key.py and
+    fake devtool processes of jobs still running, e.g. with --fail-mode hang).
+    """
+    # Job subprocesses run in sessions of their own (see jobs.run_tool), so
+    # the server's process group does not cover them: list them up front.
+    jobs = descendant_pids(proc.pid)
+
+    def kill(sig):
+        for send, pid in [(os.killpg, proc.pid)] + [(os.kill, p) for p in jobs]:
+            try:
+                send(pid, sig)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    kill(signal.SIGTERM)
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+    kill(signal.SIGKILL)
+    proc.wait()
+
+
+def run_user_job(base_url: str, args, user_idx: int):
+    """
+    One simulated user import: POST /api/import, then poll until done.
+    Returns a dict describing the outcome.
+    """
+    if args.shared_keys:
+        view_key = f"uviewfake{user_idx % args.shared_keys:08d}"
+    else:
+        view_key = f"uviewfake{secrets.token_hex(16)}"
+
+    session = requests.Session()
+    started = time.perf_counter()
+    outcome = {"ok": False, "error": None, "seconds": None, "bytes": 0, "polls": 0}
+
+    try:
+        resp = session.post(
+            base_url + "/api/import",
+            json={"view_key": view_key, "birthday": args.birthday, "wallet_name": f"load{user_idx}"},
+            timeout=args.request_timeout,
+        )
+        data = resp.json()
+        if resp.status_code != 200 or data.get("status") != "ok":
+            outcome["error"] = f"import HTTP {resp.status_code}: {data.get('error')}"
+            return outcome
+
+        job_id = data["job_id"]
+        deadline = started + args.job_timeout
+
+        while time.perf_counter() < deadline:
+            time.sleep(args.poll_interval)
+            resp = session.get(f"{base_url}/api/job/{job_id}", timeout=args.request_timeout)
+            outcome["polls"] += 1
+            data = resp.json()
+            status = data.get("status")
+
+            if status == "pending":
+                continue
+
+            outcome["seconds"] = time.perf_counter() - started
+            # Compressed size as sent by the server, not the decoded body
+            outcome["bytes"] = int(resp.headers.get("Content-Length", len(resp.content)))
+            if status == "ok":
+                outcome["ok"] = True
+            else:
+                outcome["error"] = f"job: {data.get('error')}"
+            return outcome
+
+        outcome["error"] = "timeout"
+        return outcome
+
+    except (requests.RequestException, ValueError) as e:
+        outcome["error"] = f"{type(e).__name__}"
+        return outcome
+
+
+def run_user(base_url: str, args, user_idx: int):
+    if args.ramp:
+        time.sleep(args.ramp * user_idx / max(1, args.users))
+    return [run_user_job(base_url, args, user_idx) for _ in range(args.jobs_per_user)]
+
+
+def report(results, wall_seconds, sampler):
+    total = len(results)
+    ok = [r for r in results if r["ok"]]
+    errors = {}
+    for r in results:
+        if not r["ok"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+
+    ttr = [r["seconds"] for r in ok]
+
+    def fmt(v):
+        return "n/a" if v is None else f"{v:.2f}s"
+
+    print("=" * 70)
+    print(f"Jobs:            {total} ({len(ok)} ok, {total - len(ok)} failed)")
+    print(f"Wall time:       {wall_seconds:.2f}s")
+    print(f"Throughput:      {len(ok) / wall_seconds if wall_seconds else 0:.2f} results/s")
+    print(f"Time to result:  p50 {fmt(percentile(ttr, 50))}  "
+          f"p95 {fmt(percentile(ttr, 95))}  p99 {fmt(percentile(ttr, 99))}  "
+          f"max {fmt(max(ttr) if ttr else None)}")
+    print(f"Error rate:      {(total - len(ok)) / total * 100 if total else 0:.1f}%")
+    for msg, count in sorted(errors.items(), key=lambda kv: -kv[1]):
+        print(f"  {count:5d}  {msg}")
+    if ok:
+        avg_bytes = sum(r["bytes"] for r in ok) / len(ok)
+        avg_polls = sum(r["polls"] for r in ok) / len(ok)
+        print(f"Result payload:  {avg_bytes / 1024:.1f} KiB avg on the wire, {avg_polls:.1f} polls/job")
+    if sampler is not None:
+        def mib(kb):
+            return "n/a" if kb is None else f"{kb / 1024:.1f} MiB"
+
+        print(f"Memory HWM:      server {mib(sampler.server_hwm_kb)}, "
+              f"server+jobs peak {mib(sampler.tree_peak_kb)}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test /api/import + /api/job with a fake zcash-devtool.")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users (default: 10).")
+    parser.add_argument("--jobs-per-user", type=int, default=1, help="Sequential imports per user (default: 1).")
+    parser.add_argument("--ramp", type=float, default=0.0, help="Spread user start times over this many seconds.")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between polls (UI uses 2s).")
+    parser.add_argument("--job-timeout", type=float, default=300.0, help="Give up on a job after this many seconds.")
+    parser.add_argument("--request-timeout", type=float, default=30.0, help="Per-HTTP-request timeout.")
+    parser.add_argument("--birthday", type=int, default=3000000)
+    parser.add_argument("--shared-keys", type=int, default=0,
+                        help="Reuse this many view keys across users (0 = every job gets a new key).")
+    parser.add_argument("--base-url", help="Target an existing server instead of starting one.")
+
+    fake = parser.add_argument_group("fake zcash-devtool (ignored with --base-url)")
+    fake.add_argument("--latency", default="init-fvk=0.2,sync=2,enhance=0.5,list-tx=0.1",
+                      help="Seconds per command, a single number or 'sync=2,enhance=0.5,...'.")
+    fake.add_argument("--jitter", type=float, default=0.2)
+    fake.add_argument("--fail-rate", type=float, default=0.0)
+    fake.add_argument("--fail-mode", default="exit", choices=["exit", "treestate", "locked", "missing", "hang"])
+    fake.add_argument("--fail-step", default="sync", choices=["init-fvk", "sync", "enhance", "list-tx"])
+    fake.add_argument("--txs", type=int, default=50, help="Transactions per wallet.")
+    fake.add_argument("--memo-bytes", type=int, default=64)
+    fake.add_argument("--tool-timeout", type=int,
+                      help="Server-side job timeout in seconds (VIEWKEY_JOB_TIMEOUT), e.g. with --fail-mode hang.")
+    fake.add_argument("--keep", action="store_true", help="Keep the scratch directory afterwards.")
+
+    args = parser.parse_args()
+
+    server = None
+    sampler = None
+    log_file = None
+    scratch = None
+
+    if args.base_url:
+        base_url = args.base_url.rstrip("/")
+    else:
+        scratch = tempfile.mkdtemp(prefix="viewkey-load-")
+        server, base_url, log_file, log_path = start_server(args, scratch)
+        print(f"Started server at {base_url} (log: {log_path})")
+        sampler = MemorySampler(server.pid)
+        sampler.start()
+
+    try:
+        print(f"Running {args.users} users x {args.jobs_per_user} jobs against {base_url} …")
+        started = time.perf_counter()
+        results = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.users) as pool:
+            futures = [pool.submit(run_user, base_url, args, i) for i in range(args.users)]
+            for fut in concurrent.futures.as_completed(futures):
+                results.extend(fut.result())
+        wall = time.perf_counter() - started
+
+        if sampler is not None:
+            sampler.stop()
+        report(results, wall, sampler)
+
+    finally:
+        if server is not None:
+            stop_server(server)
+        if log_file is not None:
+            log_file.close()
+        if scratch is not None:
+            if args.keep:
+                print(f"Scratch dir kept at {scratch}")
+            else:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,24 +3,28 @@ import os
 import sys
 import argparse
 import re
+import shlex
 # <-- Removed datetime import
 
 # --- CONFIGURATION ---
 # Path to the zcash-devtool repository folder
 DEVTOOL_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "zcash-devtool")
+# Optional replacement for "cargo run --release --" (e.g. the fake devtool
+# in loadtest/, so the service can be load-tested without lightwalletd)
+DEVTOOL_CMD = os.environ.get("ZCASH_DEVTOOL_CMD", "")
 # ---------------------
 
-def run_command(command, capture_output=False):
+def run_command(command, capture_output=False, cwd=DEVTOOL_PATH):
     """
-    Runs a subprocess command from within the DEVTOOL_PATH.
+    Runs a subprocess command from within cwd (DEVTOOL_PATH by default).
     """
     print("-" * 70)
     print(f"Running: {' '.join(command)}")
-    print(f"In directory: {DEVTOOL_PATH}")
+    print(f"In directory: {cwd}")
     print("-" * 70)
     
-    if not os.path.exists(DEVTOOL_PATH):
-        print(f"Error: zcash-devtool path not found at: {DEVTOOL_PATH}", file=sys.stderr)
+    if not os.path.exists(cwd):
+        print(f"Error: zcash-devtool path not found at: {cwd}", file=sys.stderr)
         print("Please make sure the 'zcash-devtool' folder is in the same directory as this script.", file=sys.stderr)
         sys.exit(1)
     
@@ -29,7 +33,7 @@ def run_command(command, capture_output=False):
             # Used for list-tx where we want to capture the text
             result = subprocess.run(
                 command,
-                cwd=DEVTOOL_PATH,  # Run from the devtool directory
+                cwd=cwd,  # Run from the devtool directory
                 capture_output=True,
                 text=True,
                 encoding='utf-8',
@@ -40,7 +44,7 @@ def run_command(command, capture_output=False):
             # Used for init, sync, enhance
             with subprocess.Popen(
                 command,
-                cwd=DEVTOOL_PATH,  # Run from the devtool directory
+                cwd=cwd,  # Run from the devtool directory
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT, 
                 text=True,
@@ -113,6 +117,12 @@ def main():
         default="zecrocks", 
         help="The lightwalletd server to use (default: zecrocks)."
     )
+    parser.add_argument(
+        "--devtool-cmd",
+        default=DEVTOOL_CMD,
+        help="Command to use instead of 'cargo run --release --' in the zcash-devtool folder "
+             "(default: $ZCASH_DEVTOOL_CMD). Runs from the current directory."
+    )
     
     args = parser.parse_args()
 
@@ -130,7 +140,12 @@ def main():
     if output_parent_dir:
         os.makedirs(output_parent_dir, exist_ok=True)
 
-    cargo_base = ["cargo", "run", "--release", "--"]
+    if args.devtool_cmd:
+        cargo_base = shlex.split(args.devtool_cmd)
+        devtool_cwd = os.getcwd()
+    else:
+        cargo_base = ["cargo", "run", "--release", "--"]
+        devtool_cwd = DEVTOOL_PATH
 
     # --- Step 1: Initialize Wallet (if it doesn't exist) ---
     if not os.path.exists(args.wallet_dir):
@@ -144,7 +159,7 @@ def main():
             "-s", args.server,
             "--disable-tor"
         ]
-        run_command(init_cmd)
+        run_command(init_cmd, cwd=devtool_cwd)
     else:
         print(f"Wallet folder '{args.wallet_dir}' already exists. Skipping initialization.")
 
@@ -155,7 +170,7 @@ def main():
         "sync",
         "-s", args.server
     ]
-    run_command(sync_cmd)
+    run_command(sync_cmd, cwd=devtool_cwd)
 
     # --- Step 3: Enhance Transactions (to get memos) ---
     print("Enhancing transactions to decrypt memos...")
@@ -165,7 +180,7 @@ def main():
         "-s", args.server,
         "--disable-tor"
     ]
-    run_command(enhance_cmd)
+    run_command(enhance_cmd, cwd=devtool_cwd)
 
     # --- Step 4: Export TXT File ---
     
@@ -179,7 +194,7 @@ def main():
         "list-tx"
     ]
     
-    txt_output = run_command(list_tx_txt_cmd, capture_output=True)
+    txt_output = run_command(list_tx_txt_cmd, capture_output=True, cwd=devtool_cwd)
     try:
         with open(txt_filename, 'w', encoding='utf-8') as f:
             f.write(txt_output)
@@ -0,0 +1,239 @@
+"""
+Frontend asset serving: content fingerprints, compression and caching.
+
+index.html is served with every /assets/ URL fingerprinted (?v=<hash>) and
+an import map that fingerprints the ES modules main.js imports; it is
+rendered (and compressed) once and kept until index.html, the module list or
+one of the fingerprinted assets changes. Requests that carry the current
+fingerprint get a year-long immutable Cache-Control; anything else is
+revalidated with its ETag.
+
+Run this file to write .gz (and .br, if brotli is installed) copies of the
+assets so nothing has to be compressed at request time:
+
+    python static_assets.py
+"""
+import functools
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import threading
+
+from flask import Response, abort, request, send_file
+from werkzeug.security import safe_join
+
+from compression import brotli, choose_encoding, compress, is_compressible
+from config import (
+    COMPRESS_MIN_SIZE,
+    FRONTEND_ASSETS_DIR,
+    FRONTEND_DIR,
+    USE_PRECOMPRESSED_ASSETS,
+)
+
+log = logging.getLogger(__name__)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+PRECOMPRESSED_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+_ASSET_REF_RE = re.compile(r'(?P<attr>href|src)="(?P<url>/assets/[^"?#]+)"')
+
+INDEX_PATH = os.path.join(FRONTEND_DIR, "index.html")
+JS_DIR = os.path.join(FRONTEND_ASSETS_DIR, "js")
+
+# Last rendered index.html: {"key", "html", "etag", "versions", "compressed"}
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=256)
+def _file_hash(path: str, mtime_ns: int, size: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            h.update(block)
+    return h.hexdigest()[:12]
+
+
+def asset_version(path: str):
+    """
+    Content fingerprint of a file (cached until it changes), or None.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _file_hash(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=128)
+def _compressed_asset(path: str, version: str, encoding: str) -> bytes:
+    with open(path, "rb") as f:
+        data = f.read()
+    log.info("Compressing %s (%s)", os.path.basename(path), encoding)
+    return compress(data, encoding, best=True)
+
+
+def _versioned_url(url: str, versions: dict) -> str:
+    path = os.path.join(FRONTEND_ASSETS_DIR, url[len("/assets/"):])
+    version = versions[path] = asset_version(path)
+    return f"{url}?v={version}" if version else url
+
+
+def render_index_html():
+    """
+    index.html with fingerprinted asset URLs and an import map so the
+    module graph under /assets/js is fingerprinted too.
+
+    Returns (html, versions) where versions maps each fingerprinted file to
+    the version used.
+    """
+    versions = {}
+    with open(INDEX_PATH, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    html = _ASSET_REF_RE.sub(
+        lambda m: f'{m["attr"]}="{_versioned_url(m["url"], versions)}"', html
+    )
+
+    imports = {
+        f"/assets/js/{name}": _versioned_url(f"/assets/js/{name}", versions)
+        for name in sorted(os.listdir(JS_DIR))
+        if name.endswith(".js")
+    }
+    importmap = f'<script type="importmap">{json.dumps({"imports": imports})}</script>\n  '
+    html = html.replace('<script type="module"', importmap + '<script type="module"', 1)
+    return html, versions
+
+
+def _index_key():
+    # index.html itself, plus the directory mtime for modules added/removed
+    return os.stat(INDEX_PATH).st_mtime_ns, os.stat(JS_DIR).st_mtime_ns
+
+
+def _current_index():
+    """
+    The cached render of index.html, re-rendered only when index.html or
+    any asset it fingerprints has changed. Caller holds _INDEX_LOCK.
+    """
+    global _INDEX
+
+    key = _index_key()
+    if (
+        _INDEX is not None
+        and _INDEX["key"] == key
+        and all(asset_version(p) == v for p, v in _INDEX["versions"].items())
+    ):
+        return _INDEX
+
+    html, versions = render_index_html()
+    data = html.encode("utf-8")
+    _INDEX = {
+        "key": key,
+        "html": data,
+        "etag": hashlib.sha256(data).hexdigest()[:16],
+        "versions": versions,
+        "compressed": {},
+    }
+    log.info("Rendered index.html (%d bytes)", len(data))
+    return _INDEX
+
+
+def send_index():
+    encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+
+    with _INDEX_LOCK:
+        index = _current_index()
+        if len(index["html"]) < COMPRESS_MIN_SIZE:
+            encoding = None
+        if encoding is None:
+            body, etag = index["html"], index["etag"]
+        else:
+            if encoding not in index["compressed"]:
+                index["compressed"][encoding] = compress(index["html"], encoding, best=True)
+            body, etag = index["compressed"][encoding], f'{index["etag"]}-{encoding}'
+
+    resp = Response(body, mimetype="text/html")
+    if encoding is not None:
+        # Already compressed: compress_response() leaves it alone
+        resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = REVALIDATE
+    return resp.make_conditional(request)
+
+
+def send_asset(filename: str):
+    """
+    Serve a file from FRONTEND_ASSETS_DIR, compressed if the client accepts
+    it: from a precompressed sibling when present, else compressed once and
+    kept in memory.
+    """
+    path = safe_join(FRONTEND_ASSETS_DIR, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    version = asset_version(path)
+    mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    encoding = None
+    if is_compressible(mimetype) and os.path.getsize(path) >= COMPRESS_MIN_SIZE:
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+
+    if encoding is None:
+        resp = send_file(path, mimetype=mimetype, conditional=True, etag=version, max_age=0)
+    else:
+        precompressed = path + PRECOMPRESSED_SUFFIX[encoding]
+        if (
+            USE_PRECOMPRESSED_ASSETS
+            and os.path.isfile(precompressed)
+            and os.path.getmtime(precompressed) >= os.path.getmtime(path)
+        ):
+            resp = send_file(
+                precompressed,
+                mimetype=mimetype,
+                conditional=True,
+                etag=f"{version}-{encoding}",
+                max_age=0,
+            )
+        else:
+            resp = Response(_compressed_asset(path, version, encoding), mimetype=mimetype)
+            resp.set_etag(f"{version}-{encoding}")
+            resp = resp.make_conditional(request)
+        resp.headers["Content-Encoding"] = encoding
+
+    if is_compressible(mimetype):
+        resp.vary.add("Accept-Encoding")
+    resp.headers["Cache-Control"] = IMMUTABLE if request.args.get("v") == version else REVALIDATE
+    return resp
+
+
+def precompress_assets():
+    """
+    Write .gz / .br siblings for every compressible asset.
+    """
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    count = 0
+    for root, _, files in os.walk(FRONTEND_ASSETS_DIR):
+        for name in files:
+            if name.endswith((".gz", ".br")):
+                continue
+            path = os.path.join(root, name)
+            mimetype = mimetypes.guess_type(path)[0]
+            if not is_compressible(mimetype) or os.path.getsize(path) < COMPRESS_MIN_SIZE:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            for encoding in encodings:
+                with open(path + PRECOMPRESSED_SUFFIX[encoding], "wb") as out:
+                    out.write(compress(data, encoding, best=True))
+                count += 1
+            print(f"Precompressed {os.path.relpath(path, FRONTEND_DIR)}")
+    print(f"Wrote {count} precompressed files ({', '.join(encodings)}).")
+
+
+if __name__ == "__main__":
+    precompress_assets()
@@ -0,0 +1,86 @@
+import json
+
+# Same columns as the frontend's buildCsvFromTransactions()
+CSV_HEADERS = [
+    "txid",
+    "mined_height",
+    "mined_time",
+    "amount",
+    "fee",
+    "note_summary",
+    "output_index",
+    "output_pool",
+    "output_value",
+    "output_account",
+    "output_to",
+    "output_memo",
+]
+
+# Rows are joined into chunks of this many before being yielded, so the
+# response stays streamed without one write per row.
+ROWS_PER_CHUNK = 500
+
+
+def _csv_escape(value) -> str:
+    if value is None:
+        return ""
+    s = str(value).replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
+    if '"' in s or "," in s:
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+
+def _csv_rows(tx):
+    base = [
+        tx.get("txid"),
+        tx.get("mined_height"),
+        tx.get("mined_time"),
+        tx.get("amount"),
+        tx.get("fee"),
+        tx.get("note_summary"),
+    ]
+    outputs = tx.get("outputs") or []
+    if not outputs:
+        yield ",".join(_csv_escape(v) for v in base + [None] * 6)
+        return
+    for out in outputs:
+        out = out or {}
+        row = base + [
+            out.get("index"),
+            out.get("pool"),
+            out.get("value"),
+            out.get("account"),
+            out.get("to"),
+            out.get("memo"),
+        ]
+        yield ",".join(_csv_escape(v) for v in row)
+
+
+def _chunked(lines, sep: str):
+    buf = []
+    for line in lines:
+        buf.append(line)
+        if len(buf) >= ROWS_PER_CHUNK:
+            yield sep.join(buf) + sep
+            buf = []
+    if buf:
+        yield sep.join(buf) + sep
+
+
+def iter_csv(txs):
+    """
+    Yield CSV text chunks (header + one row per output) for txs.
+    """
+    def lines():
+        yield ",".join(CSV_HEADERS)
+        for tx in txs:
+            yield from _csv_rows(tx)
+
+    return _chunked(lines(), "\r\n")
+
+
+def iter_jsonl(txs):
+    """
+    Yield JSON Lines chunks, one transaction object per line.
+    """
+    return _chunked((json.dumps(tx, ensure_ascii=False) for tx in txs), "\n")
@@ -19,7 +19,14 @@ def parse_list_tx_text(text: str):
     It is intentionally tolerant: if something doesn't match, it just stores
     the raw line instead of failing.
     """
-    lines = text.splitlines()
+    return parse_list_tx_lines(text.splitlines())
+
+
+def parse_list_tx_lines(lines):
+    """
+    Same as parse_list_tx_text(), for a list of lines (without newlines), so
+    a file can be parsed without also holding its whole text in memory.
+    """
     txs = []
 
     current_tx = None
@@ -137,3 +144,70 @@ def filter_txs_by_birthday(txs, birthday: int):
             birthday,
         )
     return filtered
+
+
+def _search_text(tx) -> str:
+    chunks = [tx.get("txid"), tx.get("amount"), tx.get("fee")]
+    if tx.get("mined_height") is not None:
+        chunks.append(str(tx["mined_height"]))
+    chunks += [tx.get("mined_time"), tx.get("note_summary")]
+    for out in tx.get("outputs") or []:
+        if out:
+            chunks += [out.get("value"), out.get("account"), out.get("to"), out.get("memo")]
+    return "\n".join(c for c in chunks if c).lower()
+
+
+def parse_amount(value) -> float:
+    """
+    Same loose amount parsing as the frontend's parseAmount().
+    """
+    cleaned = "".join(c for c in str(value or "") if c.isdigit() or c in ".-")
+    try:
+        return float(cleaned)
+    except ValueError:
+        return 0.0
+
+
+def iter_filtered_txs(txs, query=None, height_from=None, height_to=None, min_height=None):
+    """
+    Yield transactions matching the UI's filters: free-text query over
+    txid/amounts/memos/addresses and an inclusive height range.
+
+    min_height is the birthday cut-off of filter_txs_by_birthday(), applied
+    lazily: it drops txs mined below it but, unlike the range, keeps unmined ones.
+    """
+    q = (query or "").strip().lower()
+    for tx in txs:
+        if min_height is not None:
+            h = tx.get("mined_height")
+            if h is not None and h < min_height:
+                continue
+        if q and q not in _search_text(tx):
+            continue
+        if height_from is not None or height_to is not None:
+            h = tx.get("mined_height")
+            if not isinstance(h, int):
+                continue
+            if height_from is not None and h < height_from:
+                continue
+            if height_to is not None and h > height_to:
+                continue
+        yield tx
+
+
+SORT_KEYS = {
+    "height_asc": (lambda tx: tx.get("mined_height") or 0, False),
+    "height_desc": (lambda tx: tx.get("mined_height") or 0, True),
+    "amount_asc": (lambda tx: parse_amount(tx.get("amount")), False),
+    "amount_desc": (lambda tx: parse_amount(tx.get("amount")), True),
+    "time_asc": (lambda tx: tx.get("mined_time") or "", False),
+    "time_desc": (lambda tx: tx.get("mined_time") or "", True),
+}
+
+
+def sort_txs(txs, sort_mode: str = "height_desc"):
+    """
+    Return txs ordered like the UI's sort select (default: newest first).
+    """
+    key, reverse = SORT_KEYS.get(sort_mode, SORT_KEYS["height_desc"])
+    return sorted(txs, key=key, reverse=reverse)
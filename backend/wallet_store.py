@@ -0,0 +1,107 @@
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from config import EXPORTS_DIR, WALLET_CACHE_MAX_TXS
+from tx_parser import parse_list_tx_lines
+
+log = logging.getLogger(__name__)
+
+# Slugs come from wallet_slug_from_key(): "vk_" + 16 hex chars.
+SLUG_RE = re.compile(r"^vk_[0-9a-f]{16}$")
+
+# Parsed exports kept in memory, keyed by slug: an LRU holding at most
+# WALLET_CACHE_MAX_TXS transactions in total.
+_CACHE = OrderedDict()
+_CACHE_TXS = 0
+_CACHE_LOCK = threading.Lock()
+
+
+def is_valid_slug(slug: str) -> bool:
+    return bool(slug) and SLUG_RE.match(slug) is not None
+
+
+def export_path_for_slug(slug: str) -> str:
+    """
+    Path of the list-tx export written by read_view_key.py for this slug.
+    """
+    return os.path.join(EXPORTS_DIR, f"{slug}_txs.txt")
+
+
+def export_version(path: str):
+    """
+    Short version tag for an export file, derived from mtime + size.
+    Returns None if the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def load_wallet_transactions(slug: str):
+    """
+    Return (transactions, version) for the stored export of this wallet,
+    or (None, None) if there is no export yet.
+
+    Parsed results are cached until the export file changes.
+    """
+    path = export_path_for_slug(slug)
+    version = export_version(path)
+    if version is None:
+        return None, None
+
+    with _CACHE_LOCK:
+        cached = _CACHE.get(slug)
+        if cached and cached[0] == version:
+            _CACHE.move_to_end(slug)
+            return cached[1], version
+
+    with open(path, "r", encoding="utf-8") as f:
+        txs = parse_list_tx_lines([line.rstrip("\r\n") for line in f])
+
+    _cache_put(slug, version, txs)
+    log.info("Parsed export for %s (%d txs, version %s)", slug, len(txs), version)
+    return txs, version
+
+
+def _cache_put(slug, version, txs):
+    global _CACHE_TXS
+
+    with _CACHE_LOCK:
+        old = _CACHE.pop(slug, None)
+        if old is not None:
+            _CACHE_TXS -= len(old[1])
+        if len(txs) > WALLET_CACHE_MAX_TXS:
+            return
+
+        _CACHE[slug] = (version, txs)
+        _CACHE_TXS += len(txs)
+        while _CACHE_TXS > WALLET_CACHE_MAX_TXS:
+            _, (_, evicted) = _CACHE.popitem(last=False)
+            _CACHE_TXS -= len(evicted)
+
+
+def latest_height(txs):
+    """
+    Highest known mined_height in txs, or None.
+    """
+    heights = [tx["mined_height"] for tx in txs if isinstance(tx.get("mined_height"), int)]
+    return max(heights) if heights else None
+
+
+def transactions_since(txs, since_height):
+    """
+    Transactions the client does not have yet: mined above since_height,
+    plus any without a known height (unmined / still changing).
+    """
+    if since_height is None:
+        return txs
+
+    return [
+        tx for tx in txs
+        if not isinstance(tx.get("mined_height"), int) or tx["mined_height"] > since_height
+    ]
@@ -25,3 +25,66 @@ export async function pollJob(jobId) {
   const data = await res.json();
   return { ok: res.ok, data };
 }
+
+// Transactions newer than sinceHeight from the wallet's last sync, with the
+// same birthday cut-off as the import result.
+// Returns { status: 304, data: null } when etag still matches.
+export async function fetchWalletDelta(slug, sinceHeight, etag, birthday = null) {
+  const params = new URLSearchParams();
+  if (sinceHeight != null) params.set("since_height", sinceHeight);
+  if (birthday != null) params.set("birthday", birthday);
+  const qs = params.toString();
+  const res = await fetch(
+    `/api/wallet/${encodeURIComponent(slug)}/transactions${qs ? `?${qs}` : ""}`,
+    {
+      headers: etag ? { "If-None-Match": etag } : {},
+      cache: "no-store", // we revalidate ourselves from IndexedDB
+    }
+  );
+  if (res.status === 304) return { status: 304, data: null, etag };
+  const data = await res.json();
+  return { status: res.status, data, etag: res.headers.get("ETag") };
+}
+
+// URL of the server-side streaming export (fmt: "csv" | "jsonl") with the
+// same filters the UI applies.
+export function walletExportUrl(slug, fmt, filters = {}) {
+  const params = new URLSearchParams();
+  if (filters.filterText) params.set("q", filters.filterText);
+  if (filters.heightFrom != null) params.set("height_from", filters.heightFrom);
+  if (filters.heightTo != null) params.set("height_to", filters.heightTo);
+  if (filters.sortMode) params.set("sort", filters.sortMode);
+  if (filters.birthday != null) params.set("birthday", filters.birthday);
+  const qs = params.toString();
+  return `/api/wallet/${encodeURIComponent(slug)}/export.${fmt}${qs ? `?${qs}` : ""}`;
+}
+
+export function rawExportUrl(slug) {
+  return `/api/wallet/${encodeURIComponent(slug)}/raw`;
+}
+
+// One page of the raw list-tx export via HTTP Range (length null = to the
+// end). Pass the ETag of earlier pages as ifRange so a changed export is not
+// spliced onto them: the server then sends the whole current file instead.
+// Resolves to { bytes: Uint8Array, total: full file size in bytes, etag,
+// partial: false when bytes is the whole file from offset 0 }.
+export async function fetchRawRange(slug, start, length = null, ifRange = null) {
+  const end = length != null ? start + length - 1 : "";
+  const headers = { Range: `bytes=${start}-${end}` };
+  if (ifRange) headers["If-Range"] = ifRange;
+
+  const res = await fetch(rawExportUrl(slug), { headers });
+  if (res.status === 416) {
+    return { bytes: new Uint8Array(0), total: start, etag: ifRange, partial: true };
+  }
+  if (!res.ok) throw new Error(`Raw export request failed (${res.status})`);
+
+  const bytes = new Uint8Array(await res.arrayBuffer());
+  const etag = res.headers.get("ETag");
+  if (res.status === 206) {
+    const m = /\/(\d+)$/.exec(res.headers.get("Content-Range") || "");
+    return { bytes, total: m ? Number(m[1]) : start + bytes.length, etag, partial: true };
+  }
+  // 200: Range ignored (or If-Range did not match), this is the whole file
+  return { bytes, total: bytes.length, etag, partial: false };
+}
@@ -0,0 +1,96 @@
+// cache.js
+// Parsed wallet results persisted per slug in IndexedDB, so a wallet the
+// browser has seen renders instantly and only needs a delta from the API.
+// Every helper resolves to null / no-ops when IndexedDB is unavailable.
+
+const DB_NAME = "zcash-view";
+const DB_VERSION = 1;
+const WALLETS = "wallets";
+const META = "meta";
+
+let dbPromise = null;
+
+function openDb() {
+  if (dbPromise) return dbPromise;
+
+  dbPromise = new Promise((resolve) => {
+    if (!("indexedDB" in window)) {
+      resolve(null);
+      return;
+    }
+
+    const req = indexedDB.open(DB_NAME, DB_VERSION);
+    req.onupgradeneeded = () => {
+      const db = req.result;
+      if (!db.objectStoreNames.contains(WALLETS)) {
+        db.createObjectStore(WALLETS, { keyPath: "slug" });
+      }
+      if (!db.objectStoreNames.contains(META)) {
+        db.createObjectStore(META);
+      }
+    };
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => {
+      console.warn("IndexedDB unavailable, result cache disabled:", req.error);
+      resolve(null);
+    };
+  });
+
+  return dbPromise;
+}
+
+async function run(storeName, mode, fn) {
+  const db = await openDb();
+  if (!db) return null;
+
+  return new Promise((resolve) => {
+    const tx = db.transaction(storeName, mode);
+    const req = fn(tx.objectStore(storeName));
+    tx.oncomplete = () => resolve(req ? req.result ?? null : null);
+    tx.onerror = () => {
+      console.warn("IndexedDB request failed:", tx.error);
+      resolve(null);
+    };
+    tx.onabort = tx.onerror;
+  });
+}
+
+// Record: { slug, wallet_name, birthday, latest_height, etag, transactions, saved_at }
+export function getCachedWallet(slug) {
+  if (!slug) return Promise.resolve(null);
+  return run(WALLETS, "readonly", (store) => store.get(slug));
+}
+
+export async function saveCachedWallet(record) {
+  if (!record?.slug) return;
+  await run(WALLETS, "readwrite", (store) =>
+    store.put({ ...record, saved_at: Date.now() })
+  );
+  await run(META, "readwrite", (store) => store.put(record.slug, "lastSlug"));
+}
+
+export function getLastWalletSlug() {
+  return run(META, "readonly", (store) => store.get("lastSlug"));
+}
+
+// Apply a delta (new or changed txs) on top of cached ones, keyed by txid.
+// Every delta carries all txs that have no mined height yet, so cached ones
+// without a height are dropped first: an unmined tx that expired or left the
+// export disappears instead of lingering in the cache.
+export function mergeTransactions(cached, delta) {
+  const byTxid = new Map();
+  (cached || []).forEach((tx) => {
+    if (typeof tx?.mined_height === "number") byTxid.set(tx.txid, tx);
+  });
+  (Array.isArray(delta) ? delta : []).forEach((tx) => byTxid.set(tx.txid, tx));
+  return Array.from(byTxid.values());
+}
+
+export function latestHeight(txs) {
+  let max = null;
+  (txs || []).forEach((tx) => {
+    const h = tx?.mined_height;
+    if (typeof h === "number" && (max === null || h > max)) max = h;
+  });
+  return max;
+}
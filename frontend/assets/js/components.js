@@ -104,108 +104,224 @@ export function initPresetUI(presetRow, viewKeyInput, birthdayInput, presetStatu
 }
 
 // ---- Transactions list ----
-export function renderTransactions(structuredOutput, txs) {
-  structuredOutput.innerHTML = "";
-
-  if (!txs || !txs.length) {
-    const empty = document.createElement("div");
-    empty.style.fontSize = "12px";
-    empty.style.color = "#9ca3af";
-    empty.textContent = "No transactions found for this key, height range, and filters.";
-    structuredOutput.appendChild(empty);
-    return;
+function metaItem(label, value) {
+  const span = document.createElement("span");
+  const labelEl = document.createElement("span");
+  labelEl.className = "tx-meta-label";
+  labelEl.textContent = label;
+  span.append(labelEl, ` ${value}`);
+  return span;
+}
+
+function outputField(label, value) {
+  const f = document.createElement("div");
+  f.className = "tx-output-field";
+  const labelEl = document.createElement("span");
+  labelEl.className = "label";
+  labelEl.textContent = label;
+  f.append(labelEl, ` ${value}`);
+  return f;
+}
+
+// Fill (or refill, when a row is recycled) a .tx-card element for one tx.
+export function fillTransactionCard(card, tx) {
+  card.className = "tx-card";
+
+  const header = document.createElement("div");
+  header.className = "tx-card-header";
+
+  const idSpan = document.createElement("div");
+  idSpan.className = "tx-id";
+  idSpan.textContent = shortenTxid(tx.txid);
+
+  const amtSpan = document.createElement("div");
+  amtSpan.className = "tx-amount";
+  amtSpan.textContent = tx.amount || "—";
+
+  header.appendChild(idSpan);
+  header.appendChild(amtSpan);
+
+  const parts = [header];
+
+  const metaRow = document.createElement("div");
+  metaRow.className = "tx-meta-row";
+
+  if (tx.mined_height !== undefined) {
+    metaRow.appendChild(metaItem("Height", tx.mined_height));
   }
 
-  txs.forEach((tx) => {
-    const card = document.createElement("div");
-    card.className = "tx-card";
+  if (tx.mined_time) {
+    metaRow.appendChild(metaItem("Mined", tx.mined_time));
+  }
+
+  if (tx.note_summary) {
+    metaRow.appendChild(metaItem("Notes", tx.note_summary));
+  }
+
+  if (metaRow.childNodes.length) {
+    parts.push(metaRow);
+  }
+
+  if (tx.outputs && tx.outputs.length) {
+    tx.outputs.forEach((out) => {
+      const outDiv = document.createElement("div");
+      outDiv.className = "tx-output";
 
-    const header = document.createElement("div");
-    header.className = "tx-card-header";
+      const heading = document.createElement("div");
+      heading.className = "tx-output-heading";
+      const idx = out.index !== undefined ? `#${out.index}` : "";
+      const pool = out.pool ? ` · ${out.pool}` : "";
+      heading.textContent = `Output ${idx}${pool}`;
+      outDiv.appendChild(heading);
 
-    const idSpan = document.createElement("div");
-    idSpan.className = "tx-id";
-    idSpan.textContent = shortenTxid(tx.txid);
+      if (out.value) outDiv.appendChild(outputField("Value:", out.value));
+      if (out.account) outDiv.appendChild(outputField("Account:", out.account));
+      if (out.to) outDiv.appendChild(outputField("To:", out.to));
+      if (out.memo) outDiv.appendChild(outputField("Memo:", out.memo));
 
-    const amtSpan = document.createElement("div");
-    amtSpan.className = "tx-amount";
-    amtSpan.textContent = tx.amount || "—";
+      parts.push(outDiv);
+    });
+  }
 
-    header.appendChild(idSpan);
-    header.appendChild(amtSpan);
-    card.appendChild(header);
+  card.replaceChildren(...parts);
+  return card;
+}
 
-    const metaRow = document.createElement("div");
-    metaRow.className = "tx-meta-row";
+function createEmptyMessage() {
+  const empty = document.createElement("div");
+  empty.style.fontSize = "12px";
+  empty.style.color = "#9ca3af";
+  empty.textContent = "No transactions found for this key, height range, and filters.";
+  return empty;
+}
 
-    if (tx.mined_height !== undefined) {
-      const h = document.createElement("span");
-      h.innerHTML = `<span class="tx-meta-label">Height</span> ${tx.mined_height}`;
-      metaRow.appendChild(h);
+// ---- Virtualized transactions list ----
+// Only rows near the viewport exist in the DOM, and row elements are
+// recycled as the page scrolls, so "Show all" on a large wallet stays cheap.
+// Cards vary in height (outputs, memos): each one is measured once rendered
+// and the height is cached per transaction object.
+export function createTransactionList(
+  container,
+  { estimatedRowHeight = 160, gap = 10, overscan = 800 } = {}
+) {
+  let items = [];
+  let offsets = new Float64Array(1);
+  const heights = new WeakMap(); // tx -> measured card height
+  const active = new Map(); // tx -> card element currently shown
+  const pool = []; // hidden card elements ready for reuse
+  const emptyEl = createEmptyMessage();
+  let frame = null;
+
+  container.innerHTML = "";
+  container.classList.add("tx-list-virtual");
+
+  function layout() {
+    offsets = new Float64Array(items.length + 1);
+    for (let i = 0; i < items.length; i++) {
+      offsets[i + 1] = offsets[i] + (heights.get(items[i]) ?? estimatedRowHeight) + gap;
     }
+    container.style.height = items.length ? `${offsets[items.length] - gap}px` : "";
+  }
 
-    if (tx.mined_time) {
-      const t = document.createElement("span");
-      t.innerHTML = `<span class="tx-meta-label">Mined</span> ${tx.mined_time}`;
-      metaRow.appendChild(t);
+  // Last row whose top is at or above y.
+  function indexAt(y) {
+    let lo = 0;
+    let hi = items.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >> 1;
+      if (offsets[mid] <= y) lo = mid;
+      else hi = mid - 1;
     }
+    return lo;
+  }
 
-    if (tx.note_summary) {
-      const ns = document.createElement("span");
-      ns.innerHTML = `<span class="tx-meta-label">Notes</span> ${tx.note_summary}`;
-      metaRow.appendChild(ns);
+  function release(tx, card) {
+    active.delete(tx);
+    card.style.display = "none";
+    pool.push(card);
+  }
+
+  function releaseAll() {
+    for (const [tx, card] of active) release(tx, card);
+  }
+
+  function render() {
+    frame = null;
+    if (!items.length) return;
+
+    // Hidden (e.g. output section collapsed): nothing can be measured.
+    if (container.offsetParent === null) {
+      releaseAll();
+      return;
+    }
+
+    const rect = container.getBoundingClientRect();
+    const top = Math.max(0, -rect.top - overscan);
+    const bottom = window.innerHeight - rect.top + overscan;
+    const start = indexAt(top);
+    let end = start;
+    while (end < items.length && offsets[end] < bottom) end++;
+
+    const visible = new Set(items.slice(start, end));
+    for (const [tx, card] of active) {
+      if (!visible.has(tx)) release(tx, card);
     }
 
-    if (metaRow.childNodes.length) {
-      card.appendChild(metaRow);
+    for (let i = start; i < end; i++) {
+      const tx = items[i];
+      let card = active.get(tx);
+      if (!card) {
+        card = pool.pop() || document.createElement("div");
+        fillTransactionCard(card, tx);
+        card.style.display = "";
+        if (card.parentNode !== container) container.appendChild(card);
+        active.set(tx, card);
+      }
+      card.style.top = `${offsets[i]}px`;
     }
 
-    if (tx.outputs && tx.outputs.length) {
-      tx.outputs.forEach((out) => {
-        const outDiv = document.createElement("div");
-        outDiv.className = "tx-output";
-
-        const heading = document.createElement("div");
-        heading.className = "tx-output-heading";
-        const idx = out.index !== undefined ? `#${out.index}` : "";
-        const pool = out.pool ? ` · ${out.pool}` : "";
-        heading.textContent = `Output ${idx}${pool}`;
-        outDiv.appendChild(heading);
-
-        if (out.value) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">Value:</span> ${out.value}`;
-          outDiv.appendChild(f);
-        }
-
-        if (out.account) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">Account:</span> ${out.account}`;
-          outDiv.appendChild(f);
-        }
-
-        if (out.to) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">To:</span> ${out.to}`;
-          outDiv.appendChild(f);
-        }
-
-        if (out.memo) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">Memo:</span> ${out.memo}`;
-          outDiv.appendChild(f);
-        }
-
-        card.appendChild(outDiv);
-      });
+    // Replace estimates with real heights; re-layout if anything moved.
+    let changed = false;
+    for (let i = start; i < end; i++) {
+      const h = active.get(items[i]).offsetHeight;
+      if (heights.get(items[i]) !== h) {
+        heights.set(items[i], h);
+        changed = true;
+      }
     }
 
-    structuredOutput.appendChild(card);
-  });
+    if (changed) {
+      layout();
+      for (let i = start; i < end; i++) {
+        active.get(items[i]).style.top = `${offsets[i]}px`;
+      }
+      schedule();
+    }
+  }
+
+  function schedule() {
+    if (frame === null) frame = requestAnimationFrame(render);
+  }
+
+  function setItems(txs) {
+    items = Array.isArray(txs) ? txs : [];
+
+    if (!items.length) {
+      releaseAll();
+      layout();
+      if (emptyEl.parentNode !== container) container.appendChild(emptyEl);
+      return;
+    }
+
+    emptyEl.remove();
+    layout();
+    render();
+  }
+
+  window.addEventListener("scroll", schedule, { passive: true });
+  window.addEventListener("resize", schedule);
+
+  return { setItems, refresh: schedule };
 }
 
 // ---- Pagination UI ----
@@ -0,0 +1,24 @@
+// filter.worker.js
+// Runs filter + sort off the UI thread. The search index is built once per
+// "load"; each "query" only scans it and posts back matching indices.
+import { buildSearchIndex, filterAndSortIndices } from "./filters.js";
+
+let transactions = [];
+let searchIndex = buildSearchIndex([]);
+
+self.onmessage = (e) => {
+  const msg = e.data || {};
+
+  if (msg.type === "load") {
+    transactions = Array.isArray(msg.transactions) ? msg.transactions : [];
+    searchIndex = buildSearchIndex(transactions);
+    return;
+  }
+
+  if (msg.type === "query") {
+    const indices = Int32Array.from(
+      filterAndSortIndices(transactions, searchIndex, msg.filters || {})
+    );
+    self.postMessage({ id: msg.id, indices }, [indices.buffer]);
+  }
+};
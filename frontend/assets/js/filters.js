@@ -0,0 +1,95 @@
+// filters.js
+// Pure filter + sort helpers, shared by the UI thread (hooks.js) and
+// filter.worker.js. No DOM access here so it can run inside a Worker.
+import { parseAmount } from "./utils.js";
+
+// Lower-cased text the free-text filter matches against.
+function buildSearchText(tx) {
+  if (!tx) return "";
+  const chunks = [];
+
+  if (tx.txid) chunks.push(tx.txid);
+  if (tx.amount) chunks.push(tx.amount);
+  if (tx.fee) chunks.push(tx.fee);
+  if (tx.mined_height != null) chunks.push(String(tx.mined_height));
+  if (tx.mined_time) chunks.push(tx.mined_time);
+  if (tx.note_summary) chunks.push(tx.note_summary);
+
+  if (Array.isArray(tx.outputs)) {
+    tx.outputs.forEach((out) => {
+      if (!out) return;
+      if (out.value) chunks.push(out.value);
+      if (out.account) chunks.push(out.account);
+      if (out.to) chunks.push(out.to);
+      if (out.memo) chunks.push(out.memo);
+    });
+  }
+
+  // "\n" never appears in the (single-line) filter input, so a query can't
+  // match across two fields.
+  return chunks.join("\n").toLowerCase();
+}
+
+// Precompute once per result: search corpus + parsed amounts for sorting.
+export function buildSearchIndex(txs) {
+  const list = Array.isArray(txs) ? txs : [];
+  const text = new Array(list.length);
+  const amounts = new Float64Array(list.length);
+
+  for (let i = 0; i < list.length; i++) {
+    text[i] = buildSearchText(list[i]);
+    amounts[i] = parseAmount(list[i]?.amount);
+  }
+
+  return { text, amounts };
+}
+
+// Returns indices into txs that pass the filters, in display order.
+export function filterAndSortIndices(txs, index, filters = {}) {
+  const list = Array.isArray(txs) ? txs : [];
+  const q = (filters.filterText || "").toLowerCase();
+  const heightFrom = filters.heightFrom ?? null;
+  const heightTo = filters.heightTo ?? null;
+  const hasHeightFilter = heightFrom != null || heightTo != null;
+
+  const out = [];
+  for (let i = 0; i < list.length; i++) {
+    const tx = list[i];
+    if (!tx) continue;
+
+    if (q && !index.text[i].includes(q)) continue;
+
+    if (hasHeightFilter) {
+      const h = tx.mined_height;
+      if (typeof h !== "number") continue;
+      if (heightFrom != null && h < heightFrom) continue;
+      if (heightTo != null && h > heightTo) continue;
+    }
+
+    out.push(i);
+  }
+
+  const height = (i) => list[i].mined_height ?? 0;
+  const time = (i) => list[i].mined_time || "";
+
+  out.sort((a, b) => {
+    switch (filters.sortMode) {
+      case "height_asc":
+        return height(a) - height(b);
+      case "height_desc":
+        return height(b) - height(a);
+      case "amount_asc":
+        return index.amounts[a] - index.amounts[b];
+      case "amount_desc":
+        return index.amounts[b] - index.amounts[a];
+      case "time_asc":
+        return time(a).localeCompare(time(b));
+      case "time_desc":
+        return time(b).localeCompare(time(a));
+      default:
+        return height(b) - height(a);
+    }
+  });
+
+  return out;
+}
@@ -1,5 +1,6 @@
 // hooks.js
-import { formatDuration, parseAmount } from "./utils.js";
+import { formatDuration } from "./utils.js";
+import { buildSearchIndex, filterAndSortIndices } from "./filters.js";
 
 // ---- Tips "hook" ----
 export function createTipsController(waitTipEl, tips) {
@@ -31,79 +32,79 @@ export function createTipsController(waitTipEl, tips) {
   return { start, stop };
 }
 
-// ---- Filtering + sorting hook ----
-export function createFilterState() {
-  return {
-    filterText: "",
-    sortMode: "height_desc",
-    heightFrom: null,
-    heightTo: null,
-
-    apply(allTransactions) {
-      let txs = Array.isArray(allTransactions) ? [...allTransactions] : [];
-
-      // text filter
-      if (this.filterText) {
-        const q = this.filterText.toLowerCase();
-        txs = txs.filter((tx) => {
-          if (!tx) return false;
-          const chunks = [];
-
-          if (tx.txid) chunks.push(tx.txid);
-          if (tx.amount) chunks.push(tx.amount);
-          if (tx.fee) chunks.push(tx.fee);
-          if (tx.mined_height != null) chunks.push(String(tx.mined_height));
-          if (tx.mined_time) chunks.push(tx.mined_time);
-          if (tx.note_summary) chunks.push(tx.note_summary);
-
-          if (Array.isArray(tx.outputs)) {
-            tx.outputs.forEach((out) => {
-              if (!out) return;
-              if (out.value) chunks.push(out.value);
-              if (out.account) chunks.push(out.account);
-              if (out.to) chunks.push(out.to);
-              if (out.memo) chunks.push(out.memo);
-            });
-          }
-
-          return chunks.some((v) => v && v.toLowerCase().includes(q));
-        });
-      }
+// ---- Off-main-thread filtering hook ----
+// load(txs) once per result, then query(filters) -> Promise<tx[] | null>.
+// A query superseded by a newer one resolves to null so callers can drop it.
+// Falls back to filtering on the UI thread if module workers are unavailable.
+export function createFilterWorker() {
+  let worker = null;
+  let transactions = [];
+  let localIndex = null;
+  let nextId = 0;
+  let pending = null;
+
+  function queryLocally(filters) {
+    if (!localIndex) localIndex = buildSearchIndex(transactions);
+    return filterAndSortIndices(transactions, localIndex, filters).map(
+      (i) => transactions[i]
+    );
+  }
 
-      // height filter
-      if (this.heightFrom != null || this.heightTo != null) {
-        txs = txs.filter((tx) => {
-          const h = tx.mined_height;
-          if (typeof h !== "number") return false;
-          if (this.heightFrom != null && h < this.heightFrom) return false;
-          if (this.heightTo != null && h > this.heightTo) return false;
-          return true;
-        });
+  function supersedePending() {
+    if (pending) {
+      pending.resolve(null);
+      pending = null;
+    }
+  }
+
+  try {
+    worker = new Worker(new URL("./filter.worker.js", import.meta.url), {
+      type: "module",
+    });
+
+    worker.onmessage = (e) => {
+      const { id, indices } = e.data || {};
+      if (!pending || pending.id !== id) return;
+      const { resolve } = pending;
+      pending = null;
+      resolve(Array.from(indices, (i) => transactions[i]));
+    };
+
+    worker.onerror = (e) => {
+      console.warn("Filter worker failed, filtering on main thread:", e.message);
+      if (e.preventDefault) e.preventDefault();
+      worker.terminate();
+      worker = null;
+      if (pending) {
+        const { resolve, filters } = pending;
+        pending = null;
+        resolve(queryLocally(filters));
       }
+    };
+  } catch (err) {
+    console.warn("Filter worker unavailable, filtering on main thread:", err);
+    worker = null;
+  }
 
-      // sorting
-      txs.sort((a, b) => {
-        switch (this.sortMode) {
-          case "height_asc":
-            return (a.mined_height ?? 0) - (b.mined_height ?? 0);
-          case "height_desc":
-            return (b.mined_height ?? 0) - (a.mined_height ?? 0);
-          case "amount_asc":
-            return parseAmount(a.amount) - parseAmount(b.amount);
-          case "amount_desc":
-            return parseAmount(b.amount) - parseAmount(a.amount);
-          case "time_asc":
-            return (a.mined_time || "").localeCompare(b.mined_time || "");
-          case "time_desc":
-            return (b.mined_time || "").localeCompare(a.mined_time || "");
-          default:
-            return (b.mined_height ?? 0) - (a.mined_height ?? 0);
-        }
-      });
-
-      return txs;
-    },
-  };
+  function load(txs) {
+    supersedePending();
+    transactions = Array.isArray(txs) ? txs : [];
+    localIndex = null;
+    if (worker) worker.postMessage({ type: "load", transactions });
+  }
+
+  function query(filters) {
+    supersedePending();
+    if (!worker) return Promise.resolve(queryLocally(filters));
+
+    const id = ++nextId;
+    return new Promise((resolve) => {
+      pending = { id, resolve, filters };
+      worker.postMessage({ type: "query", id, filters });
+    });
+  }
+
+  return { load, query };
 }
 
 // ---- Pagination hook ----
@@ -1,4 +1,20 @@
 // main.js
+import {
+  fetchRawRange,
+  fetchWalletDelta,
+  rawExportUrl,
+  walletExportUrl,
+} from "./api.js";
+import {
+  getCachedWallet,
+  getLastWalletSlug,
+  latestHeight,
+  mergeTransactions,
+  saveCachedWallet,
+} from "./cache.js";
+import { createTransactionList } from "./components.js";
+import { createFilterWorker } from "./hooks.js";
+import { debounce, walletSlugFromKey } from "./utils.js";
 
 // === DOM ELEMENTS =====================================================
 
@@ -18,6 +34,7 @@ const structuredOutput = document.getElementById("structuredOutput");
 const rawOutputWrapper = document.getElementById("rawOutput");
 const rawOutput = rawOutputWrapper.querySelector("code");
 const toggleRawBtn = document.getElementById("toggleRawBtn");
+const rawMoreBtn = document.getElementById("rawMoreBtn");
 
 const presetRow = document.getElementById("presetRow");
 const presetStatus = document.getElementById("presetStatus");
@@ -34,6 +51,7 @@ const heightToInput = document.getElementById("heightToInput");
 const copyRawBtn = document.getElementById("copyRawBtn");
 const downloadRawBtn = document.getElementById("downloadRawBtn");
 const downloadJsonBtn = document.getElementById("downloadJsonBtn");
+const downloadJsonlBtn = document.getElementById("downloadJsonlBtn");
 const downloadCsvBtn = document.getElementById("downloadCsvBtn");
 const downloadRawFullBtn = document.getElementById("downloadRawFullBtn");
 
@@ -49,6 +67,7 @@ const showAllCheckbox = document.getElementById("showAllCheckbox");
 
 // state
 let allTransactions = [];
+let filteredTransactions = [];
 let currentPage = 1;
 let pageSize = 10;
 let showAll = false;
@@ -61,6 +80,13 @@ let heightToFilter = null;
 
 let lastResultMeta = null;
 
+// raw list-tx text is fetched on demand, RAW_PAGE_BYTES at a time
+const RAW_PAGE_BYTES = 256 * 1024;
+let rawState = { loaded: 0, total: null, etag: null, decoder: null, loading: null };
+
+const txList = createTransactionList(structuredOutput);
+const filterWorker = createFilterWorker();
+
 // === demo / presets ===================================================
 
 const DEMO_VIEW_KEY =
@@ -124,11 +150,6 @@ function shortenKey(key) {
   return key.slice(0, 6) + "…" + key.slice(-6);
 }
 
-function shortenTxid(txid) {
-  if (!txid || txid.length <= 18) return txid || "";
-  return txid.slice(0, 8) + "…" + txid.slice(-8);
-}
-
 function setStatus(msg, isError = false) {
   statusMsg.textContent = msg || "";
   statusMsg.classList.toggle("error", !!isError);
@@ -292,175 +313,6 @@ refreshHeightBtn.addEventListener("click", refreshHeight);
 
 // === transactions rendering + filters + pagination ====================
 
-function renderTransactions(txs) {
-  structuredOutput.innerHTML = "";
-
-  if (!txs || !txs.length) {
-    const empty = document.createElement("div");
-    empty.style.fontSize = "12px";
-    empty.style.color = "#9ca3af";
-    empty.textContent =
-      "No transactions found for this key, height range, and filters.";
-    structuredOutput.appendChild(empty);
-    return;
-  }
-
-  txs.forEach((tx) => {
-    const card = document.createElement("div");
-    card.className = "tx-card";
-
-    const header = document.createElement("div");
-    header.className = "tx-card-header";
-
-    const idSpan = document.createElement("div");
-    idSpan.className = "tx-id";
-    idSpan.textContent = shortenTxid(tx.txid);
-
-    const amtSpan = document.createElement("div");
-    amtSpan.className = "tx-amount";
-    amtSpan.textContent = tx.amount || "—";
-
-    header.appendChild(idSpan);
-    header.appendChild(amtSpan);
-    card.appendChild(header);
-
-    const metaRow = document.createElement("div");
-    metaRow.className = "tx-meta-row";
-
-    if (tx.mined_height !== undefined) {
-      const h = document.createElement("span");
-      h.innerHTML = `<span class="tx-meta-label">Height</span> ${tx.mined_height}`;
-      metaRow.appendChild(h);
-    }
-
-    if (tx.mined_time) {
-      const t = document.createElement("span");
-      t.innerHTML = `<span class="tx-meta-label">Mined</span> ${tx.mined_time}`;
-      metaRow.appendChild(t);
-    }
-
-    if (tx.note_summary) {
-      const ns = document.createElement("span");
-      ns.innerHTML = `<span class="tx-meta-label">Notes</span> ${tx.note_summary}`;
-      metaRow.appendChild(ns);
-    }
-
-    if (metaRow.childNodes.length) card.appendChild(metaRow);
-
-    if (tx.outputs && tx.outputs.length) {
-      tx.outputs.forEach((out) => {
-        const outDiv = document.createElement("div");
-        outDiv.className = "tx-output";
-
-        const heading = document.createElement("div");
-        heading.className = "tx-output-heading";
-        const idx = out.index !== undefined ? `#${out.index}` : "";
-        const pool = out.pool ? ` · ${out.pool}` : "";
-        heading.textContent = `Output ${idx}${pool}`;
-        outDiv.appendChild(heading);
-
-        if (out.value) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">Value:</span> ${out.value}`;
-          outDiv.appendChild(f);
-        }
-        if (out.account) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">Account:</span> ${out.account}`;
-          outDiv.appendChild(f);
-        }
-        if (out.to) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">To:</span> ${out.to}`;
-          outDiv.appendChild(f);
-        }
-        if (out.memo) {
-          const f = document.createElement("div");
-          f.className = "tx-output-field";
-          f.innerHTML = `<span class="label">Memo:</span> ${out.memo}`;
-          outDiv.appendChild(f);
-        }
-
-        card.appendChild(outDiv);
-      });
-    }
-
-    structuredOutput.appendChild(card);
-  });
-}
-
-function parseAmount(str) {
-  if (!str) return 0;
-  const cleaned = String(str).replace(/[^\d.-]/g, "");
-  const n = parseFloat(cleaned);
-  return Number.isFinite(n) ? n : 0;
-}
-
-function applyFiltersAndSorting() {
-  let txs = Array.isArray(allTransactions) ? [...allTransactions] : [];
-
-  if (filterText) {
-    const q = filterText.toLowerCase();
-    txs = txs.filter((tx) => {
-      if (!tx) return false;
-      const chunks = [];
-
-      if (tx.txid) chunks.push(tx.txid);
-      if (tx.amount) chunks.push(tx.amount);
-      if (tx.fee) chunks.push(tx.fee);
-      if (tx.mined_height != null) chunks.push(String(tx.mined_height));
-      if (tx.mined_time) chunks.push(tx.mined_time);
-      if (tx.note_summary) chunks.push(tx.note_summary);
-
-      if (Array.isArray(tx.outputs)) {
-        tx.outputs.forEach((out) => {
-          if (!out) return;
-          if (out.value) chunks.push(out.value);
-          if (out.account) chunks.push(out.account);
-          if (out.to) chunks.push(out.to);
-          if (out.memo) chunks.push(out.memo);
-        });
-      }
-
-      return chunks.some((v) => v && v.toLowerCase().includes(q));
-    });
-  }
-
-  if (heightFromFilter != null || heightToFilter != null) {
-    txs = txs.filter((tx) => {
-      const h = tx.mined_height;
-      if (typeof h !== "number") return false;
-      if (heightFromFilter != null && h < heightFromFilter) return false;
-      if (heightToFilter != null && h > heightToFilter) return false;
-      return true;
-    });
-  }
-
-  txs.sort((a, b) => {
-    switch (sortMode) {
-      case "height_asc":
-        return (a.mined_height ?? 0) - (b.mined_height ?? 0);
-      case "height_desc":
-        return (b.mined_height ?? 0) - (a.mined_height ?? 0);
-      case "amount_asc":
-        return parseAmount(a.amount) - parseAmount(b.amount);
-      case "amount_desc":
-        return parseAmount(b.amount) - parseAmount(a.amount);
-      case "time_asc":
-        return (a.mined_time || "").localeCompare(b.mined_time || "");
-      case "time_desc":
-        return (b.mined_time || "").localeCompare(a.mined_time || "");
-      default:
-        return (b.mined_height ?? 0) - (a.mined_height ?? 0);
-    }
-  });
-
-  return txs;
-}
-
 function updatePaginationUI(total, totalPages) {
   if (total === 0) {
     paginationEl.style.display = "none";
@@ -490,18 +342,37 @@ function updatePaginationUI(total, totalPages) {
   }
 }
 
+function currentFilters() {
+  return {
+    filterText,
+    sortMode,
+    heightFrom: heightFromFilter,
+    heightTo: heightToFilter,
+  };
+}
+
+// Re-run filter + sort (in the worker) and re-render the current page.
+async function refreshFilteredTransactions() {
+  const txs = await filterWorker.query(currentFilters());
+  if (txs === null) return; // superseded by a newer query
+  filteredTransactions = txs;
+  renderTransactionsPage();
+}
+
+const refreshFilteredTransactionsSoon = debounce(refreshFilteredTransactions, 150);
+
 function renderTransactionsPage() {
-  const filtered = applyFiltersAndSorting();
+  const filtered = filteredTransactions;
   const total = filtered.length;
 
   if (total === 0) {
-    renderTransactions([]);
+    txList.setItems([]);
     paginationEl.style.display = "none";
     return;
   }
 
   if (showAll) {
-    renderTransactions(filtered);
+    txList.setItems(filtered);
     const totalPages = Math.max(1, Math.ceil(total / pageSize));
     updatePaginationUI(total, totalPages);
     return;
@@ -513,7 +384,7 @@ function renderTransactionsPage() {
 
   const startIndex = (currentPage - 1) * pageSize;
   const pageTxs = filtered.slice(startIndex, startIndex + pageSize);
-  renderTransactions(pageTxs);
+  txList.setItems(pageTxs);
   updatePaginationUI(total, totalPages);
 }
 
@@ -535,7 +406,7 @@ prevPageBtn.addEventListener("click", () => {
 nextPageBtn.addEventListener("click", () => {
   const totalPages = Math.max(
     1,
-    Math.ceil(applyFiltersAndSorting().length / pageSize)
+    Math.ceil(filteredTransactions.length / pageSize)
   );
   if (!showAll && currentPage < totalPages) {
     currentPage++;
@@ -547,7 +418,7 @@ lastPageBtn.addEventListener("click", () => {
   if (!showAll) {
     const totalPages = Math.max(
       1,
-      Math.ceil(applyFiltersAndSorting().length / pageSize)
+      Math.ceil(filteredTransactions.length / pageSize)
     );
     if (currentPage !== totalPages) {
       currentPage = totalPages;
@@ -572,7 +443,7 @@ showAllCheckbox.addEventListener("change", (e) => {
 filterInput.addEventListener("input", (e) => {
   filterText = e.target.value.trim();
   currentPage = 1;
-  renderTransactionsPage();
+  refreshFilteredTransactionsSoon();
 });
 
 heightFromInput.addEventListener("input", (e) => {
@@ -580,7 +451,7 @@ heightFromInput.addEventListener("input", (e) => {
   const num = Number(val);
   heightFromFilter = val === "" || !Number.isFinite(num) ? null : num;
   currentPage = 1;
-  renderTransactionsPage();
+  refreshFilteredTransactionsSoon();
 });
 
 heightToInput.addEventListener("input", (e) => {
@@ -588,19 +459,105 @@ heightToInput.addEventListener("input", (e) => {
   const num = Number(val);
   heightToFilter = val === "" || !Number.isFinite(num) ? null : num;
   currentPage = 1;
-  renderTransactionsPage();
+  refreshFilteredTransactionsSoon();
 });
 
 sortSelect.addEventListener("change", (e) => {
   sortMode = e.target.value;
   currentPage = 1;
-  renderTransactionsPage();
+  refreshFilteredTransactions();
 });
 
+// === raw output (loaded on demand) ====================================
+
+function rawComplete() {
+  return rawState.total !== null && rawState.loaded >= rawState.total;
+}
+
+function resetRaw() {
+  rawState = {
+    loaded: 0,
+    total: null,
+    etag: null,
+    decoder: new TextDecoder(),
+    loading: null,
+  };
+  rawOutput.textContent = "";
+  rawMoreBtn.style.display = "none";
+}
+
+// Append the next `length` bytes of the raw export (null = all the rest).
+// Resolves once they are shown; concurrent calls share the request in flight.
+function loadRaw(length) {
+  const slug = lastResultMeta?.slug;
+  if (!slug || rawComplete()) return Promise.resolve();
+  if (!rawState.loading) rawState.loading = fetchRawInto(rawState, slug, length);
+  return rawState.loading;
+}
+
+function loadRawPage() {
+  return loadRaw(RAW_PAGE_BYTES);
+}
+
+async function fetchRawInto(state, slug, length) {
+  rawMoreBtn.disabled = true;
+  try {
+    const { bytes, total, etag, partial } = await fetchRawRange(
+      slug,
+      state.loaded,
+      length,
+      state.etag
+    );
+    if (state !== rawState) return; // a new result replaced this one
+
+    if (!partial && state.loaded > 0) {
+      // The export changed since the first page: the server sent the
+      // current file whole, so show that rather than mixing versions.
+      rawOutput.textContent = "";
+      state.loaded = 0;
+      state.decoder = new TextDecoder();
+    }
+    state.etag = etag || state.etag;
+    state.loaded += bytes.byteLength;
+    state.total = total;
+    const done = rawComplete() || bytes.byteLength === 0;
+    rawOutput.appendChild(
+      document.createTextNode(state.decoder.decode(bytes, { stream: !done }))
+    );
+
+    rawMoreBtn.style.display = done ? "none" : "inline-block";
+    rawMoreBtn.textContent = `Load more (${Math.round(state.loaded / 1024)} of ${Math.round(total / 1024)} KiB)`;
+  } catch (err) {
+    if (state === rawState) {
+      rawOutput.appendChild(
+        document.createTextNode(`\n[Could not load raw export: ${err.message}]`)
+      );
+    }
+  } finally {
+    state.loading = null;
+    rawMoreBtn.disabled = false;
+  }
+}
+
+// Full raw text: completes the raw view with one request for the rest
+// (same If-Range check as paging), then returns what it shows.
+async function loadFullRaw() {
+  while (rawState.loading) await rawState.loading;
+  await loadRaw(null);
+  return rawComplete() ? rawOutput.textContent || "" : "";
+}
+
 toggleRawBtn.addEventListener("click", () => {
   const visible = rawOutputWrapper.style.display !== "none";
   rawOutputWrapper.style.display = visible ? "none" : "block";
   toggleRawBtn.textContent = visible ? "Show raw text" : "Hide raw text";
+  rawMoreBtn.style.display =
+    !visible && rawState.loaded > 0 && !rawComplete() ? "inline-block" : "none";
+  if (!visible && rawState.loaded === 0) loadRawPage();
+});
+
+rawMoreBtn.addEventListener("click", () => {
+  loadRawPage();
 });
 
 // === export helpers ===================================================
@@ -626,7 +583,12 @@ function baseFilename(ext) {
 }
 
 copyRawBtn.addEventListener("click", async () => {
-  const text = rawOutput.textContent || "";
+  let text = "";
+  try {
+    text = await loadFullRaw();
+  } catch {
+    text = "";
+  }
   if (!text.trim()) {
     alert("No raw export available yet.");
     return;
@@ -650,18 +612,23 @@ copyRawBtn.addEventListener("click", async () => {
 });
 
 downloadRawFullBtn.addEventListener("click", () => {
-  const text = rawOutput.textContent || "";
-  if (!text.trim()) {
+  if (!lastResultMeta?.slug) {
     alert("No raw export available yet.");
     return;
   }
 
-  const slug = lastResultMeta?.slug || "zcash-view";
+  const slug = lastResultMeta.slug;
   const birthday =
     lastResultMeta?.birthday != null ? String(lastResultMeta.birthday) : "";
   const filename = birthday ? `${slug}_${birthday}_raw.txt` : `${slug}_raw.txt`;
 
-  triggerDownload(filename, "text/plain;charset=utf-8", text);
+  // Served straight from the export file; never held in page memory.
+  const a = document.createElement("a");
+  a.href = rawExportUrl(slug);
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  a.remove();
 });
 
 function csvEscape(value) {
@@ -720,18 +687,56 @@ function buildCsvFromTransactions(txs) {
   return rows.join("\r\n");
 }
 
-downloadCsvBtn.addEventListener("click", () => {
-  const exportTxs = applyFiltersAndSorting();
+// Let the server stream the export straight to disk. Returns false if the
+// server can't serve it (e.g. export deleted), so callers build it here.
+// The check is a HEAD on the raw export (answered from a stat), not on the
+// export URL itself, which would load and filter the wallet for nothing.
+async function downloadServerExport(fmt) {
+  const slug = lastResultMeta?.slug;
+  if (!slug) return false;
+
+  // The server only takes integer heights; build anything else here so the
+  // file matches what is on screen.
+  const filters = currentFilters();
+  if (![filters.heightFrom, filters.heightTo].every((h) => h == null || Number.isInteger(h))) {
+    return false;
+  }
+
+  const url = walletExportUrl(slug, fmt, {
+    ...filters,
+    birthday: lastResultMeta?.birthday,
+  });
+
+  try {
+    const res = await fetch(rawExportUrl(slug), { method: "HEAD" });
+    if (!res.ok) return false;
+  } catch {
+    return false;
+  }
+
+  const a = document.createElement("a");
+  a.href = url;
+  a.download = baseFilename(fmt);
+  document.body.appendChild(a);
+  a.click();
+  a.remove();
+  return true;
+}
+
+downloadCsvBtn.addEventListener("click", async () => {
+  const exportTxs = filteredTransactions;
   if (!exportTxs.length) {
     alert("No transactions match the current filters to export.");
     return;
   }
+  if (await downloadServerExport("csv")) return;
+
   const csv = buildCsvFromTransactions(exportTxs);
   triggerDownload(baseFilename("csv"), "text/csv;charset=utf-8", csv);
 });
 
 downloadJsonBtn.addEventListener("click", () => {
-  const exportTxs = applyFiltersAndSorting();
+  const exportTxs = filteredTransactions;
   if (!exportTxs.length) {
     alert("No transactions match the current filters to export.");
     return;
@@ -752,6 +757,104 @@ downloadJsonBtn.addEventListener("click", () => {
   );
 });
 
+downloadJsonlBtn.addEventListener("click", async () => {
+  const exportTxs = filteredTransactions;
+  if (!exportTxs.length) {
+    alert("No transactions match the current filters to export.");
+    return;
+  }
+  if (await downloadServerExport("jsonl")) return;
+
+  const jsonl = exportTxs.map((tx) => JSON.stringify(tx)).join("\n") + "\n";
+  triggerDownload(
+    baseFilename("jsonl"),
+    "application/x-ndjson;charset=utf-8",
+    jsonl
+  );
+});
+
+// === results + client-side cache ======================================
+
+function showResult(meta, transactions) {
+  allTransactions = transactions || [];
+  filteredTransactions = [];
+  filterWorker.load(allTransactions);
+  currentPage = 1;
+
+  lastResultMeta = {
+    wallet_name: meta.wallet_name ?? null,
+    birthday: meta.birthday ?? null,
+    slug: meta.slug ?? null,
+  };
+
+  outputMeta.textContent = ` · ${allTransactions.length} tx`;
+  resetRaw();
+  if (rawOutputWrapper.style.display !== "none") loadRawPage();
+  outputSection.style.display = "block";
+  refreshFilteredTransactions();
+}
+
+// Height the server should send transactions above, given a cached record.
+function cachedSinceHeight(cached) {
+  const h = cached.latest_height ?? latestHeight(cached.transactions);
+  if (h != null) return h;
+  return cached.birthday != null ? cached.birthday - 1 : null;
+}
+
+function saveResult(meta, transactions, etag = null) {
+  if (!meta.slug) return;
+  saveCachedWallet({
+    slug: meta.slug,
+    wallet_name: meta.wallet_name ?? null,
+    birthday: meta.birthday ?? null,
+    latest_height: latestHeight(transactions),
+    etag,
+    transactions,
+  }).catch((err) => console.warn("Saving result cache failed:", err));
+}
+
+// Render the last wallet this browser loaded, then ask the server only for
+// what changed since.
+async function restoreLastWallet() {
+  const slug = await getLastWalletSlug();
+  const cached = await getCachedWallet(slug);
+  if (!cached || startBtn.disabled) return;
+
+  showResult(cached, cached.transactions);
+  setStatus("Showing saved results. Checking for new transactions…");
+
+  try {
+    const { status, data, etag } = await fetchWalletDelta(
+      slug,
+      cachedSinceHeight(cached),
+      cached.etag,
+      cached.birthday
+    );
+    if (startBtn.disabled) return; // an import started meanwhile
+
+    if (status === 200 && data?.status === "ok") {
+      const merged = mergeTransactions(cached.transactions, data.transactions);
+      const known = new Set((cached.transactions || []).map((tx) => tx.txid));
+      const added = merged.filter((tx) => !known.has(tx.txid)).length;
+      saveResult(cached, merged, etag);
+      if (data.transactions?.length || merged.length !== (cached.transactions || []).length) {
+        showResult(cached, merged);
+      }
+      setStatus(
+        added
+          ? `Showing saved results + ${added} new transactions.`
+          : "Showing saved results (up to date)."
+      );
+    } else if (status === 304) {
+      setStatus("Showing saved results (up to date).");
+    } else {
+      setStatus("Showing saved results.");
+    }
+  } catch {
+    setStatus("Showing saved results (server unreachable).");
+  }
+}
+
 // === error prettifier =================================================
 
 function prettifyErrorMessage(raw) {
@@ -802,6 +905,8 @@ vkForm.addEventListener("submit", async (e) => {
 
   // reset state
   allTransactions = [];
+  filteredTransactions = [];
+  filterWorker.load([]);
   currentPage = 1;
   pageSize = DEFAULT_PAGE_SIZE;
   showAll = false;
@@ -825,6 +930,16 @@ vkForm.addEventListener("submit", async (e) => {
   startTips();
   updateSteps(0);
 
+  // Seen this wallet before (same birthday)? Show it now, sync only the delta.
+  let cached = null;
+  try {
+    cached = await getCachedWallet(await walletSlugFromKey(viewKey));
+  } catch (err) {
+    console.warn("Reading result cache failed:", err);
+  }
+  if (cached && cached.birthday !== Number(birthday)) cached = null;
+  if (cached) showResult(cached, cached.transactions);
+
   try {
     const startRes = await fetch("/api/import", {
       method: "POST",
@@ -833,6 +948,7 @@ vkForm.addEventListener("submit", async (e) => {
         view_key: viewKey,
         birthday: Number(birthday),
         wallet_name: walletName,
+        since_height: cached ? cachedSinceHeight(cached) : undefined,
       }),
     });
     const startData = await startRes.json();
@@ -876,20 +992,15 @@ vkForm.addEventListener("submit", async (e) => {
           hideProgress();
           stopTips();
 
-          allTransactions = pollData.transactions || [];
-          currentPage = 1;
+          let txs = pollData.transactions || [];
+          if (pollData.delta && cached) {
+            txs = mergeTransactions(cached.transactions, txs);
+          }
 
-          lastResultMeta = {
-            wallet_name: pollData.wallet_name ?? null,
-            birthday: pollData.birthday ?? null,
-            slug: pollData.slug ?? null,
-          };
+          showResult(pollData, txs);
+          saveResult(pollData, txs);
 
           const txCount = allTransactions.length;
-          outputMeta.textContent = ` · ${txCount} tx`;
-          renderTransactionsPage();
-          rawOutput.textContent = pollData.raw_text || "";
-          outputSection.style.display = "block";
 
           setStatus("Done. Transactions loaded.");
           updateSteps(100);
@@ -932,6 +1043,10 @@ function boot() {
     viewKeyInput.value = DEMO_VIEW_KEY;
     birthdayInput.value = DEMO_BIRTHDAY;
   }
+
+  restoreLastWallet().catch((err) =>
+    console.warn("Restoring cached result failed:", err)
+  );
 }
 
 boot();
@@ -17,6 +17,20 @@ export function parseAmount(str) {
   return Number.isFinite(n) ? n : 0;
 }
 
+// Same slug as backend wallet_utils.wallet_slug_from_key(). Resolves to null
+// where WebCrypto is unavailable (plain-HTTP origins).
+export async function walletSlugFromKey(viewKey) {
+  if (!viewKey || !globalThis.crypto?.subtle) return null;
+  const digest = await crypto.subtle.digest(
+    "SHA-256",
+    new TextEncoder().encode(viewKey)
+  );
+  const hex = Array.from(new Uint8Array(digest), (b) =>
+    b.toString(16).padStart(2, "0")
+  ).join("");
+  return "vk_" + hex.slice(0, 16);
+}
+
 export function formatDuration(seconds) {
   seconds = Math.max(0, Math.floor(seconds || 0));
   const m = Math.floor(seconds / 60);
@@ -25,6 +39,14 @@ export function formatDuration(seconds) {
   return `${m}m ${s.toString().padStart(2, "0")}s`;
 }
 
+export function debounce(fn, wait = 150) {
+  let timer = null;
+  return (...args) => {
+    clearTimeout(timer);
+    timer = setTimeout(() => fn(...args), wait);
+  };
+}
+
 export function triggerDownload(filename, mimeType, content) {
   const blob = new Blob([content], { type: mimeType });
   const url = URL.createObjectURL(blob);